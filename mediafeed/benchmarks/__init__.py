@@ -0,0 +1,30 @@
+import contextlib
+import os
+import time
+
+import django
+
+
+def setup():
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "mediafeed.settings")
+    os.environ.setdefault("SECRET_KEY", "benchmarks")
+    django.setup()
+
+
+@contextlib.contextmanager
+def test_database():
+    from django.db import connection
+
+    old_name = connection.settings_dict["NAME"]
+    connection.creation.create_test_db(verbosity=0)
+    try:
+        yield connection
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+def timeit(func, repeat):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - started) / repeat
@@ -0,0 +1,79 @@
+"""Cost of deduplicating a feed against a growing Video table.
+
+Run from the project directory:
+
+    python -m benchmarks.dedup --rows 10000 100000 1000000
+"""
+
+import argparse
+import datetime
+import random
+import string
+
+from benchmarks import setup, test_database, timeit
+
+BATCH_SIZE = 10000
+
+
+def random_video_id():
+    return "".join(random.choices(string.ascii_letters + string.digits, k=11))
+
+
+def grow_videos(channel, count):
+    from channels.models import Video
+
+    published_date = datetime.datetime(2020, 1, 1, tzinfo=datetime.timezone.utc)
+    while count > 0:
+        batch = min(count, BATCH_SIZE)
+        Video.objects.bulk_create(
+            Video(
+                url="https://www.youtube.com/watch?v=",
+                title="Benchmark video",
+                channel=channel,
+                video_id=random_video_id(),
+                thumbnail_image="https://i.ytimg.com/vi/hqdefault.jpg",
+                published_date=published_date,
+            )
+            for _ in range(batch)
+        )
+        count -= batch
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[10000, 100000])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    setup()
+
+    from model_bakery import baker
+
+    from channels.feeds import parse_feed
+    from channels.models import Channel, Video
+    from channels.tests.utils import load_fixture
+
+    entries = list(parse_feed(load_fixture("feed.xml")))
+
+    with test_database():
+        channel = baker.make(Channel)
+        # First ingest stores the fixture videos, so every measured run only
+        # pays for the dedup lookup
+        channel.ingest_feed(entries)
+
+        print(f"{'rows':>10} {'ingest_feed':>14} {'full scan':>14}")
+        size = Video.objects.count()
+        for rows in sorted(args.rows):
+            grow_videos(channel, rows - size)
+            size = Video.objects.count()
+
+            scoped = timeit(lambda: channel.ingest_feed(entries), args.repeat)
+            full_scan = timeit(
+                lambda: list(Video.objects.values_list("video_id", flat=True)),
+                args.repeat,
+            )
+            print(f"{size:>10} {scoped * 1000:>11.2f} ms {full_scan * 1000:>11.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
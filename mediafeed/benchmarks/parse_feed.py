@@ -0,0 +1,45 @@
+"""Feed parsing: xmltodict + dateparser against the streaming parser.
+
+Run from the project directory:
+
+    python -m benchmarks.parse_feed --repeat 200
+"""
+
+import argparse
+
+from benchmarks import setup, timeit
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--fixture", default="feed.xml")
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    setup()
+
+    import dateparser
+    import xmltodict
+
+    from channels.feeds import parse_feed
+    from channels.tests.utils import load_fixture
+
+    content = load_fixture(args.fixture)
+
+    def xmltodict_dateparser():
+        channel_feed = xmltodict.parse(content.decode("utf-8"))
+        for entry in channel_feed["feed"]["entry"]:
+            dateparser.parse(entry["published"])
+
+    def streaming():
+        list(parse_feed(content))
+
+    baseline = timeit(xmltodict_dateparser, args.repeat)
+    current = timeit(streaming, args.repeat)
+    print(f"xmltodict + dateparser: {baseline * 1000:8.3f} ms/feed")
+    print(f"parse_feed:             {current * 1000:8.3f} ms/feed")
+    print(f"speedup:                {baseline / current:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,211 @@
+"""Sync throughput: replay a feed corpus from a local HTTP server.
+
+Run from the project directory:
+
+    python -m benchmarks.sync_replay --channels 500 --entries 15 --workers 8
+
+Feeds are generated, or read from the *.xml files of --corpus, and served
+by a local stand-in for YouTube with configurable latency and error rate.
+Every round syncs all the channels; later rounds exercise conditional GETs.
+"""
+
+import argparse
+import hashlib
+import http.server
+import logging
+import os
+import random
+import resource
+import threading
+import time
+
+from benchmarks import setup, test_database
+
+FEED_TEMPLATE = """<?xml version="1.0" encoding="UTF-8"?>
+<feed xmlns:yt="http://www.youtube.com/xml/schemas/2015" \
+xmlns:media="http://search.yahoo.com/mrss/" xmlns="http://www.w3.org/2005/Atom">
+ <title>Channel {channel}</title>
+ <yt:channelId>UC{channel:022d}</yt:channelId>
+{entries}
+</feed>
+"""
+
+ENTRY_TEMPLATE = """ <entry>
+  <id>yt:video:{video_id}</id>
+  <yt:videoId>{video_id}</yt:videoId>
+  <title>Video {entry} of channel {channel}</title>
+  <link rel="alternate" href="https://www.youtube.com/watch?v={video_id}"/>
+  <published>{published}</published>
+  <updated>{published}</updated>
+  <media:group>
+   <media:title>Video {entry} of channel {channel}</media:title>
+   <media:thumbnail url="https://i2.ytimg.com/vi/{video_id}/hqdefault.jpg" \
+width="480" height="360"/>
+   <media:description>{description}</media:description>
+  </media:group>
+ </entry>"""
+
+
+def generate_feed(channel, entries, description_size):
+    return FEED_TEMPLATE.format(
+        channel=channel,
+        entries="\n".join(
+            ENTRY_TEMPLATE.format(
+                channel=channel,
+                entry=entry,
+                video_id=f"{channel:06d}-{entry:04d}",
+                published=f"2020-06-{28 - entry % 28:02d}T12:{entry % 60:02d}:00+00:00",
+                description="x" * description_size,
+            )
+            for entry in range(entries)
+        ),
+    ).encode("utf-8")
+
+
+def load_corpus(path):
+    feeds = []
+    for name in sorted(os.listdir(path)):
+        if name.endswith(".xml"):
+            with open(os.path.join(path, name), "rb") as feed:
+                feeds.append(feed.read())
+    return feeds
+
+
+class FeedServer(http.server.ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, feeds, latency, error_rate, seed):
+        super().__init__(("127.0.0.1", 0), FeedHandler)
+        self.feeds = feeds
+        self.etags = [f'"{hashlib.sha1(feed).hexdigest()}"' for feed in feeds]
+        self.latency = latency
+        self.error_rate = error_rate
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+
+    def url(self, index):
+        return f"http://127.0.0.1:{self.server_port}/feeds/{index}.xml"
+
+
+class FeedHandler(http.server.BaseHTTPRequestHandler):
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            latency = server.random.uniform(0, 2 * server.latency)
+            error = server.random.random() < server.error_rate
+        time.sleep(latency)
+
+        try:
+            index = int(self.path.rsplit("/", 1)[-1].split(".")[0])
+            feed = server.feeds[index]
+        except (ValueError, IndexError):
+            self.send_error(404)
+            return
+        if error:
+            self.send_error(500)
+            return
+
+        etag = server.etags[index]
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/atom+xml")
+        self.send_header("Content-Length", str(len(feed)))
+        self.send_header("ETag", etag)
+        self.end_headers()
+        self.wfile.write(feed)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--channels", type=int, default=200)
+    parser.add_argument("--entries", type=int, default=15, help="Entries per feed")
+    parser.add_argument(
+        "--description-size",
+        type=int,
+        default=500,
+        help="Characters of each generated entry description",
+    )
+    parser.add_argument(
+        "--corpus", help="Directory of recorded feeds, used instead of generating"
+    )
+    parser.add_argument(
+        "--latency", type=float, default=0.05, help="Mean response latency (s)"
+    )
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--batch-size", type=int, default=50)
+    parser.add_argument("--rounds", type=int, default=2)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    setup()
+    # Failures are counted in the summary of each round
+    logging.getLogger("channels.sync").setLevel(logging.CRITICAL)
+
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext, override_settings
+
+    from channels.models import Channel
+    from channels.sync import sync_channels
+
+    if args.corpus:
+        corpus = load_corpus(args.corpus)
+        feeds = [corpus[index % len(corpus)] for index in range(args.channels)]
+    else:
+        feeds = [
+            generate_feed(channel, args.entries, args.description_size)
+            for channel in range(args.channels)
+        ]
+    print(
+        f"{len(feeds)} feeds, {sum(map(len, feeds)) / len(feeds) / 1024:.1f} KiB "
+        f"on average, {args.latency * 1000:.0f} ms latency, "
+        f"{args.error_rate:.0%} errors"
+    )
+
+    server = FeedServer(feeds, args.latency, args.error_rate, args.seed)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    http_client = {
+        "BACKEND": "channels.http.HTTPClient",
+        "OPTIONS": {"retries": 0, "pool_size": args.workers},
+    }
+    with override_settings(HTTP_CLIENT=http_client), test_database():
+        Channel.objects.bulk_create(
+            Channel(
+                title=f"Channel {index}",
+                url=f"https://www.youtube.com/channel/UC{index:022d}",
+                feed_url=server.url(index),
+            )
+            for index in range(len(feeds))
+        )
+
+        for round_number in range(1, args.rounds + 1):
+            channels = list(Channel.objects.all())
+            with CaptureQueriesContext(connection) as queries:
+                summary = sync_channels(
+                    channels, workers=args.workers, batch_size=args.batch_size
+                )
+            entries = sum(result.entries for result in summary.results)
+            print(f"round {round_number}: {summary}")
+            print(
+                f"  {summary.channels_per_second:8.1f} channels/s"
+                f"  {entries / summary.elapsed:8.1f} entries/s"
+                f"  {len(queries):6d} queries"
+                f"  {len(queries) / max(summary.channels, 1):6.1f} queries/channel"
+            )
+
+    server.shutdown()
+    # ru_maxrss is in kilobytes on Linux
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"peak memory: {peak:.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
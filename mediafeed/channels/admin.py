@@ -1,18 +1,63 @@
 from django.contrib import admin
 
-from channels.models import Category, Channel, Feed, Video
+from channels.models import (
+    Category,
+    Channel,
+    Feed,
+    Job,
+    SyncRun,
+    SyncRunChannel,
+    Video,
+)
 
 
 class VideoInline(admin.TabularInline):
     model = Video
 
 
+class SyncHealthFilter(admin.SimpleListFilter):
+    title = "sync health"
+    parameter_name = "health"
+
+    def lookups(self, request, model_admin):
+        return (
+            ("healthy", "Healthy"),
+            ("failing", "Failing"),
+            ("parked", "Parked"),
+        )
+
+    def queryset(self, request, queryset):
+        if self.value() == "healthy":
+            return queryset.filter(failure_count=0, parked_at__isnull=True)
+        if self.value() == "failing":
+            return queryset.filter(failure_count__gt=0, parked_at__isnull=True)
+        if self.value() == "parked":
+            return queryset.filter(parked_at__isnull=False)
+        return queryset
+
+
 @admin.register(Channel)
 class ChannelAdmin(admin.ModelAdmin):
+    list_display = (
+        "title",
+        "next_sync_at",
+        "failure_count",
+        "last_error_at",
+        "parked_at",
+    )
+    list_filter = (SyncHealthFilter,)
+    readonly_fields = ("failure_count", "last_error", "last_error_at", "parked_at")
+    actions = ["unpark_channels"]
     inlines = [
         VideoInline,
     ]
 
+    def unpark_channels(self, request, queryset):
+        for channel in queryset:
+            channel.unpark()
+
+    unpark_channels.short_description = "Unpark and sync again"
+
 
 @admin.register(Category)
 class CategoryAdmin(admin.ModelAdmin):
@@ -22,6 +67,8 @@ class CategoryAdmin(admin.ModelAdmin):
 
 class FeedInline(admin.TabularInline):
     model = Feed
+    fields = ("digest", "content")
+    readonly_fields = ("digest", "content")
 
 
 @admin.register(Video)
@@ -31,4 +78,53 @@ class VideoAdmin(admin.ModelAdmin):
     ]
 
 
-admin.site.register(Feed)
+@admin.register(Feed)
+class FeedAdmin(admin.ModelAdmin):
+    list_display = ("video", "digest")
+    fields = ("video", "digest", "content")
+    readonly_fields = ("video", "digest", "content")
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = ("kind", "status", "attempts", "user", "created_at")
+    list_filter = ("kind", "status")
+
+
+class SyncRunChannelInline(admin.TabularInline):
+    model = SyncRunChannel
+    can_delete = False
+    extra = 0
+    readonly_fields = (
+        "channel",
+        "status_code",
+        "response_size",
+        "wait_time",
+        "download_time",
+        "parse_time",
+        "ingest_time",
+        "entries",
+        "new_videos",
+        "skipped",
+        "error",
+    )
+
+    def has_add_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(SyncRun)
+class SyncRunAdmin(admin.ModelAdmin):
+    list_display = (
+        "started_at",
+        "elapsed",
+        "workers",
+        "channels",
+        "new_videos",
+        "unchanged",
+        "failures",
+    )
+    readonly_fields = list_display
+    inlines = [
+        SyncRunChannelInline,
+    ]
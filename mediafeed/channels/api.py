@@ -0,0 +1,135 @@
+import json
+
+from django.contrib.auth.models import User
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import Http404, JsonResponse, StreamingHttpResponse
+from django.shortcuts import get_object_or_404
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from django.views.decorators.http import require_GET
+
+from channels.models import Category, TimelineEntry
+from channels.pagination import after_cursor, encode_cursor, get_page_size
+
+PERIODS = ("all", "week", "last_24h")
+
+# Field of the API -> (columns it needs, value of a timeline entry)
+VIDEO_FIELDS = {
+    "id": (["video__video_id"], lambda entry: entry.video.video_id),
+    "title": (["video__title"], lambda entry: entry.video.title),
+    "url": (["video__url"], lambda entry: entry.video.url),
+    "thumbnail": (
+        ["video__thumbnail_image"],
+        lambda entry: entry.video.thumbnail_image,
+    ),
+    "published_date": ([], lambda entry: entry.published_date),
+    "channel": (
+        ["video__channel__title", "video__channel__url"],
+        lambda entry: {
+            "title": entry.video.channel.title,
+            "url": entry.video.channel.url,
+        },
+    ),
+}
+
+
+def error(message):
+    return JsonResponse({"error": message}, status=400)
+
+
+def get_categories(request, user):
+    categories = Category.objects.filter(user=user)
+    if request.user != user:
+        categories = categories.filter(public=True)
+    return categories
+
+
+def serialize_video(entry, fields):
+    return {field: VIDEO_FIELDS[field][1](entry) for field in fields}
+
+
+@require_GET
+def categories(request, username):
+    user = get_object_or_404(User, username=username)
+    categories = get_categories(request, user).order_by("title")
+    if not categories and request.user != user:
+        raise Http404()
+
+    return JsonResponse(
+        {
+            "categories": [
+                {
+                    "title": category.title,
+                    "slug": category.slug,
+                    "public": category.public,
+                    "videos": request.build_absolute_uri(
+                        reverse("api:category_videos", args=(username, category.slug))
+                    ),
+                }
+                for category in categories
+            ]
+        }
+    )
+
+
+@require_GET
+def category_videos(request, username, slug):
+    user = get_object_or_404(User, username=username)
+    category = get_object_or_404(get_categories(request, user), slug=slug)
+
+    fields = request.GET.get("fields")
+    fields = fields.split(",") if fields else list(VIDEO_FIELDS)
+    unknown = [field for field in fields if field not in VIDEO_FIELDS]
+    if unknown:
+        return error(f"Unknown fields: {', '.join(unknown)}")
+
+    period = request.GET.get("period", "all")
+    if period not in PERIODS:
+        return error(f"Unknown period: {period}")
+
+    entries = TimelineEntry.objects.filter(category=category).for_period(period)
+    since = request.GET.get("since")
+    if since:
+        try:
+            since = parse_datetime(since)
+        except ValueError:
+            since = None
+        if since is None:
+            return error("since must be an ISO 8601 datetime")
+        if timezone.is_naive(since):
+            since = timezone.make_aware(since)
+        entries = entries.filter(published_date__gt=since)
+
+    # Only the columns of the requested fields are read
+    columns = [column for field in fields for column in VIDEO_FIELDS[field][0]]
+    if columns:
+        related = "video__channel" if "channel" in fields else "video"
+        entries = entries.select_related(related)
+    entries = entries.only("published_date", "video_id", *columns)
+
+    page_size = get_page_size(request.GET.get("page_size"))
+    entries = after_cursor(entries, request.GET.get("before"), "video_id")
+    return StreamingHttpResponse(
+        stream_videos(request, entries[: page_size + 1], page_size, fields),
+        content_type="application/json",
+    )
+
+
+def stream_videos(request, entries, page_size, fields):
+    # Videos are encoded one at a time as they are read from the database,
+    # and whether there is a next page is only known at the end
+    yield '{"videos": ['
+    last = None
+    next_url = None
+    for count, entry in enumerate(entries.iterator()):
+        if count == page_size:
+            query = request.GET.copy()
+            query["before"] = encode_cursor(last.published_date, last.video_id)
+            next_url = request.build_absolute_uri("?" + query.urlencode())
+            break
+        if count:
+            yield ", "
+        yield json.dumps(serialize_video(entry, fields), cls=DjangoJSONEncoder)
+        last = entry
+    yield f'], "next": {json.dumps(next_url)}}}'
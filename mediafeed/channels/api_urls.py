@@ -0,0 +1,13 @@
+from django.urls import path
+
+from channels import api
+
+app_name = "api"
+urlpatterns = [
+    path("<username>/categories/", api.categories, name="categories"),
+    path(
+        "<username>/categories/<slug>/videos/",
+        api.category_videos,
+        name="category_videos",
+    ),
+]
@@ -3,3 +3,6 @@ from django.apps import AppConfig
 
 class ChannelsConfig(AppConfig):
     name = "channels"
+
+    def ready(self):
+        from channels import signals  # noqa: F401
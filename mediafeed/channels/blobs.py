@@ -0,0 +1,86 @@
+import functools
+import hashlib
+import os
+import tempfile
+import zlib
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.utils.module_loading import import_string
+
+
+def get_digest(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+class DatabaseBlobStore:
+    """Compressed blobs in the FeedBlob side table."""
+
+    def put_many(self, contents):
+        from channels.models import FeedBlob
+
+        digests = []
+        blobs = {}
+        for content in contents:
+            data = content.encode("utf-8")
+            digest = get_digest(data)
+            blobs[digest] = zlib.compress(data)
+            digests.append(digest)
+
+        FeedBlob.objects.bulk_create(
+            [FeedBlob(digest=digest, data=data) for digest, data in blobs.items()],
+            ignore_conflicts=True,
+        )
+        return digests
+
+    def get(self, digest):
+        from channels.models import FeedBlob
+
+        data = FeedBlob.objects.values_list("data", flat=True).get(digest=digest)
+        return zlib.decompress(data).decode("utf-8")
+
+
+class FileSystemBlobStore:
+    """Compressed blobs stored on disk under location/ab/cd/<digest>."""
+
+    def __init__(self, location):
+        self.location = location
+
+    def path(self, digest):
+        return os.path.join(self.location, digest[:2], digest[2:4], digest)
+
+    def put_many(self, contents):
+        digests = []
+        for content in contents:
+            data = content.encode("utf-8")
+            digest = get_digest(data)
+            path = self.path(digest)
+            if not os.path.exists(path):
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                # Written to a temporary file first so readers never see a
+                # partial blob
+                fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path))
+                with os.fdopen(fd, "wb") as blob:
+                    blob.write(zlib.compress(data))
+                os.replace(temp_path, path)
+            digests.append(digest)
+        return digests
+
+    def get(self, digest):
+        with open(self.path(digest), "rb") as blob:
+            return zlib.decompress(blob.read()).decode("utf-8")
+
+
+@functools.lru_cache(maxsize=None)
+def get_blob_store():
+    if settings.FEED_BLOB_STORE is None:
+        return None
+    store_class = import_string(settings.FEED_BLOB_STORE["BACKEND"])
+    return store_class(**settings.FEED_BLOB_STORE.get("OPTIONS", {}))
+
+
+@receiver(setting_changed)
+def reset_blob_store(setting, **kwargs):
+    if setting == "FEED_BLOB_STORE":
+        get_blob_store.cache_clear()
@@ -0,0 +1,96 @@
+import datetime
+import io
+import json
+from collections import namedtuple
+from xml.etree import ElementTree
+
+import dateparser
+import xmltodict
+
+ATOM_NAMESPACE = "http://www.w3.org/2005/Atom"
+YOUTUBE_NAMESPACE = "http://www.youtube.com/xml/schemas/2015"
+MEDIA_NAMESPACE = "http://search.yahoo.com/mrss/"
+
+ENTRY = f"{{{ATOM_NAMESPACE}}}entry"
+TITLE = f"{{{ATOM_NAMESPACE}}}title"
+LINK = f"{{{ATOM_NAMESPACE}}}link"
+PUBLISHED = f"{{{ATOM_NAMESPACE}}}published"
+VIDEO_ID = f"{{{YOUTUBE_NAMESPACE}}}videoId"
+THUMBNAIL = f"{{{MEDIA_NAMESPACE}}}group/{{{MEDIA_NAMESPACE}}}thumbnail"
+
+FeedEntry = namedtuple(
+    "FeedEntry",
+    ["video_id", "url", "title", "thumbnail_image", "published_date", "raw"],
+)
+
+
+def parse_datetime(value):
+    # YouTube always publishes RFC 3339 timestamps, which fromisoformat parses
+    # much faster than dateparser. Python < 3.11 does not accept the "Z"
+    # suffix, so it is normalized first.
+    try:
+        parsed = datetime.datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return dateparser.parse(value)
+
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=datetime.timezone.utc)
+    return parsed
+
+
+def parse_entry(element):
+    video_id = element.findtext(VIDEO_ID)
+    # WebSub notifications have no media:group
+    thumbnail = element.find(THUMBNAIL)
+    if thumbnail is not None:
+        thumbnail_image = thumbnail.get("url")
+    else:
+        thumbnail_image = f"https://i.ytimg.com/vi/{video_id}/hqdefault.jpg"
+
+    return FeedEntry(
+        video_id=video_id,
+        url=element.find(LINK).get("href"),
+        title=element.findtext(TITLE),
+        thumbnail_image=thumbnail_image,
+        published_date=parse_datetime(element.findtext(PUBLISHED)),
+        # Prefixes are generated by ElementTree, as registering the usual ones
+        # would change how every other module serializes XML
+        raw=ElementTree.tostring(element, encoding="unicode"),
+    )
+
+
+def entry_from_json(value):
+    """Convert an entry stored as xmltodict JSON by older versions to XML."""
+    entry = {
+        "@xmlns": ATOM_NAMESPACE,
+        "@xmlns:yt": YOUTUBE_NAMESPACE,
+        "@xmlns:media": MEDIA_NAMESPACE,
+        **json.loads(value),
+    }
+    return xmltodict.unparse({"entry": entry}, full_document=False)
+
+
+def parse_feed(content, watermark=None):
+    """Yield a FeedEntry for each entry of a YouTube Atom feed.
+
+    The document is parsed incrementally and every entry element is released
+    as soon as its record has been built.
+
+    YouTube lists entries newest first, so when a (published_date, video_id)
+    watermark is given parsing stops at the first entry that is not newer
+    than it.
+    """
+    for _, element in ElementTree.iterparse(io.BytesIO(content)):
+        if element.tag == ENTRY:
+            entry = parse_entry(element)
+            if watermark is not None and is_seen(entry, watermark):
+                return
+            yield entry
+            element.clear()
+
+
+def is_seen(entry, watermark):
+    published_date, video_id = watermark
+    return entry.published_date < published_date or (
+        entry.published_date == published_date and entry.video_id == video_id
+    )
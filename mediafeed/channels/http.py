@@ -0,0 +1,128 @@
+import datetime
+import functools
+import random
+import time
+
+import requests
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.utils.module_loading import import_string
+from requests.adapters import HTTPAdapter
+
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+class ResponseTooLarge(requests.RequestException):
+    pass
+
+
+class HTTPClient:
+    """Shared client for every outbound fetch.
+
+    Connections are kept alive in a pool shared by all threads. Connection
+    errors, timeouts and 429/5xx responses are retried with jittered
+    exponential backoff, and bodies larger than max_response_size are
+    rejected. The elapsed time of a response includes the retries before it.
+    """
+
+    def __init__(
+        self,
+        timeout=(5, 30),
+        retries=3,
+        backoff=0.5,
+        max_backoff=30,
+        max_response_size=5 * 1024 * 1024,
+        pool_size=10,
+        user_agent="mediafeed",
+    ):
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.max_response_size = max_response_size
+
+        self.session = requests.Session()
+        self.session.headers["User-Agent"] = user_agent
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def get(self, url, headers=None):
+        return self.request(self.session.get, url, headers=headers)
+
+    def post(self, url, data=None, headers=None):
+        return self.request(self.session.post, url, data=data, headers=headers)
+
+    def request(self, send, url, **kwargs):
+        started = time.perf_counter()
+        attempt = 0
+        while True:
+            attempt_started = time.perf_counter()
+            try:
+                response = send(url, timeout=self.timeout, stream=True, **kwargs)
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt >= self.retries:
+                    raise
+                delay = self.get_backoff(attempt)
+            else:
+                if (
+                    response.status_code not in RETRY_STATUS_CODES
+                    or attempt >= self.retries
+                ):
+                    # Failed attempts and backoff sleeps count as waiting for
+                    # the response too
+                    response.elapsed += datetime.timedelta(
+                        seconds=attempt_started - started
+                    )
+                    self.read(response)
+                    return response
+                delay = self.get_retry_after(response) or self.get_backoff(attempt)
+                response.close()
+
+            time.sleep(delay)
+            attempt += 1
+
+    def get_backoff(self, attempt):
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2**attempt))
+
+    def get_retry_after(self, response):
+        try:
+            return min(self.max_backoff, int(response.headers["Retry-After"]))
+        except (KeyError, ValueError):
+            return None
+
+    def read(self, response):
+        content_length = response.headers.get("Content-Length")
+        if content_length and int(content_length) > self.max_response_size:
+            response.close()
+            raise ResponseTooLarge(
+                f"{response.url} has {content_length} bytes", response=response
+            )
+
+        chunks = []
+        size = 0
+        for chunk in response.iter_content(chunk_size=64 * 1024):
+            size += len(chunk)
+            if size > self.max_response_size:
+                response.close()
+                raise ResponseTooLarge(
+                    f"{response.url} has more than {self.max_response_size} bytes",
+                    response=response,
+                )
+            chunks.append(chunk)
+        # Same attribute requests uses to cache the body of a response, so
+        # response.content and response.text keep working
+        response._content = b"".join(chunks)
+
+
+@functools.lru_cache(maxsize=None)
+def get_http_client():
+    client_class = import_string(settings.HTTP_CLIENT["BACKEND"])
+    return client_class(**settings.HTTP_CLIENT.get("OPTIONS", {}))
+
+
+@receiver(setting_changed)
+def reset_http_client(setting, **kwargs):
+    if setting == "HTTP_CLIENT":
+        get_http_client.cache_clear()
@@ -0,0 +1,96 @@
+from django.db import transaction
+
+from channels.models import Category, Feed, TimelineEntry, Video
+from channels.page_cache import invalidate_categories
+
+
+def ingest_feeds(channel_feeds):
+    """Store the new videos of many (channel, entries) pairs at once.
+
+    All Video and Feed rows are written with bulk inserts in a single
+    transaction. Returns the number of new videos of each channel, in the
+    order the pairs were given.
+    """
+    channel_feeds = list(channel_feeds)
+    entries = [
+        (channel, entry)
+        for channel, channel_entries in channel_feeds
+        if channel_entries is not None
+        for entry in channel_entries
+    ]
+
+    with transaction.atomic():
+        seen = set(
+            Video.objects.filter(
+                video_id__in={entry.video_id for _, entry in entries}
+            ).values_list("video_id", flat=True)
+        )
+        videos = []
+        raw_entries = {}
+        for channel, entry in entries:
+            if entry.video_id in seen:
+                continue
+            seen.add(entry.video_id)
+            videos.append(
+                Video(
+                    url=entry.url,
+                    title=entry.title,
+                    channel=channel,
+                    video_id=entry.video_id,
+                    thumbnail_image=entry.thumbnail_image,
+                    published_date=entry.published_date,
+                )
+            )
+            raw_entries[entry.video_id] = entry.raw
+
+        # A concurrent sync may have stored some of these videos since the
+        # lookup above; those rows are skipped instead of failing the batch.
+        Video.objects.bulk_create(videos, ignore_conflicts=True)
+        video_pks = dict(
+            Video.objects.filter(video_id__in=raw_entries).values_list("video_id", "pk")
+        )
+        Feed.objects.bulk_create(
+            Feed.build_many(
+                [
+                    (video_pks[video_id], raw_entry)
+                    for video_id, raw_entry in raw_entries.items()
+                ]
+            ),
+            ignore_conflicts=True,
+        )
+
+        # Fan the new videos out to the timelines of their channels' categories
+        channel_categories = {}
+        updated_categories = set()
+        memberships = Category.channels.through.objects.filter(
+            channel_id__in={video.channel_id for video in videos}
+        ).values_list(
+            "channel_id", "category_id", "category__user__username", "category__slug"
+        )
+        for channel_id, category_id, username, slug in memberships:
+            channel_categories.setdefault(channel_id, []).append(category_id)
+            updated_categories.add((username, slug))
+        TimelineEntry.objects.bulk_create(
+            [
+                TimelineEntry(
+                    category_id=category_id,
+                    video_id=video_pks[video.video_id],
+                    published_date=video.published_date,
+                )
+                for video in videos
+                for category_id in channel_categories.get(video.channel_id, [])
+            ],
+            ignore_conflicts=True,
+        )
+        invalidate_categories(updated_categories)
+
+        new_videos = {channel.pk: 0 for channel, _ in channel_feeds}
+        for video in videos:
+            new_videos[video.channel_id] += 1
+
+        for channel, channel_entries in channel_feeds:
+            channel.advance_watermark(channel_entries)
+            channel.schedule_next_sync(new_videos[channel.pk])
+            channel.save(update_fields=channel.SYNC_FIELDS)
+
+    return [new_videos[channel.pk] for channel, _ in channel_feeds]
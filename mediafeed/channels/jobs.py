@@ -0,0 +1,60 @@
+import logging
+
+from django.db import transaction
+
+from channels.models import Channel, Job
+
+logger = logging.getLogger(__name__)
+
+HANDLERS = {}
+
+
+def job_handler(kind):
+    def register(func):
+        HANDLERS[kind] = func
+        return func
+
+    return register
+
+
+@job_handler("add_channel")
+def add_channel(job):
+    channel = Channel(url=job.data["url"])
+    channel.fetch_metadata()
+    entries = channel.fetch_feed()
+
+    def write():
+        channel.save()
+        channel.ingest_feed(entries)
+        if job.category is not None:
+            job.category.channels.add(channel)
+        job.channel = channel
+
+    return write
+
+
+def run_job(job):
+    # Handlers make their network calls first and return a function doing
+    # the database writes, so the transaction does not stay open (and hold
+    # the write lock) during HTTP requests. A failed job leaves nothing
+    # behind, so it can simply be retried.
+    try:
+        write = HANDLERS[job.kind](job)
+        with transaction.atomic():
+            write()
+            job.finish()
+    except Exception as exc:
+        logger.exception("Job %s (%s) failed", job.pk, job.kind)
+        job.refresh_from_db()
+        job.fail(exc)
+
+
+def run_pending_jobs(limit=None):
+    processed = 0
+    while limit is None or processed < limit:
+        job = Job.objects.claim()
+        if job is None:
+            break
+        run_job(job)
+        processed += 1
+    return processed
@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from channels.models import Category, TimelineEntry
+
+
+class Command(BaseCommand):
+    help = "Rebuild the materialized timelines of categories from their channels"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "category_ids",
+            nargs="*",
+            type=int,
+            help="Categories to rebuild, all of them by default",
+        )
+
+    def handle(self, *args, **options):
+        categories = Category.objects.all()
+        if options["category_ids"]:
+            categories = categories.filter(pk__in=options["category_ids"])
+
+        entries = 0
+        for category in categories.iterator():
+            with transaction.atomic():
+                TimelineEntry.objects.filter(category=category).delete()
+                channel_ids = category.channels.values_list("pk", flat=True)
+                entries += len(
+                    TimelineEntry.objects.add_channels([category.pk], channel_ids)
+                )
+
+        self.stdout.write(f"Rebuilt timelines with {entries} entries")
@@ -0,0 +1,33 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from channels.jobs import run_pending_jobs
+
+
+class Command(BaseCommand):
+    help = "Process background jobs, such as resolving and syncing new channels"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Process the pending jobs and exit instead of waiting for more",
+        )
+        parser.add_argument(
+            "--sleep",
+            type=int,
+            default=settings.JOB_POLL_INTERVAL,
+            help="Seconds to wait when there are no pending jobs",
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            processed = run_pending_jobs()
+            if processed:
+                self.stdout.write(f"Processed {processed} jobs")
+            if options["once"]:
+                break
+            if not processed:
+                time.sleep(options["sleep"])
@@ -0,0 +1,42 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from channels.blobs import get_blob_store
+from channels.models import Feed
+
+
+class Command(BaseCommand):
+    help = "Move raw feed entries stored inline in the Feed table to the blob store"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Number of feed entries moved per transaction",
+        )
+
+    def handle(self, *args, **options):
+        store = get_blob_store()
+        if store is None:
+            raise CommandError("FEED_BLOB_STORE is not configured")
+
+        moved = 0
+        while True:
+            with transaction.atomic():
+                feeds = list(
+                    Feed.objects.filter(digest="").exclude(feed="")[
+                        : options["batch_size"]
+                    ]
+                )
+                if not feeds:
+                    break
+
+                digests = store.put_many([feed.feed for feed in feeds])
+                for feed, digest in zip(feeds, digests):
+                    feed.digest = digest
+                    feed.feed = ""
+                Feed.objects.bulk_update(feeds, ["digest", "feed"])
+            moved += len(feeds)
+
+        self.stdout.write(f"Moved {moved} feed entries to the blob store")
@@ -1,12 +1,89 @@
+import cProfile
+import datetime
+import os
+import pstats
+import socket
+import uuid
+
+from django.conf import settings
 from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
 
-from channels.models import Channel
+from channels.models import Channel, SyncRun
+from channels.sync import sync_channels
 
 
 class Command(BaseCommand):
     help = "Sync all channels with latest videos"
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=settings.SYNC_WORKERS,
+            help="Number of feeds fetched concurrently",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=settings.SYNC_BATCH_SIZE,
+            help="Number of channels whose new videos are stored per transaction",
+        )
+        parser.add_argument(
+            "--all",
+            action="store_true",
+            help=(
+                "Sync every channel, not only the ones due to be polled, "
+                "ignoring leases held by other workers"
+            ),
+        )
+        parser.add_argument(
+            "--profile",
+            metavar="PATH",
+            help="Profile the run and write the pstats dump to PATH",
+        )
+
     def handle(self, *args, **options):
-        channels = Channel.objects.all()
-        for channel in channels:
-            channel.sync_videos()
+        if options["workers"] < 1:
+            raise CommandError("--workers must be at least 1")
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size must be at least 1")
+
+        # Without --all, due channels are leased in batches, so any number of
+        # workers, on any host, can run this command at the same time. Only
+        # what the fetching threads can take is claimed at once, so no lease
+        # runs out while its channel waits in a queue
+        owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        if options["all"]:
+            channels = Channel.objects.all()
+        else:
+            channels = Channel.objects.claim_all(owner, options["workers"] * 2)
+
+        profiler = cProfile.Profile() if options["profile"] else None
+        if profiler:
+            profiler.enable()
+        try:
+            summary = sync_channels(
+                channels,
+                workers=options["workers"],
+                batch_size=options["batch_size"],
+                profile=bool(profiler),
+            )
+        finally:
+            Channel.objects.release(owner)
+        if profiler:
+            profiler.disable()
+            stats = pstats.Stats(profiler)
+            for worker_profiler in summary.profiles:
+                stats.add(worker_profiler)
+            stats.dump_stats(options["profile"])
+
+        SyncRun.record(summary)
+        SyncRun.objects.filter(
+            started_at__lt=timezone.now()
+            - datetime.timedelta(days=settings.SYNC_RUN_RETENTION)
+        ).delete()
+
+        for channel, exc in summary.failures:
+            self.stderr.write(f"{channel} ({channel.feed_url}): {exc!r}")
+        self.stdout.write(str(summary))
@@ -0,0 +1,36 @@
+import requests
+from django.core.management.base import BaseCommand
+
+from channels import websub
+from channels.models import Channel
+
+
+class Command(BaseCommand):
+    help = "Subscribe channels to WebSub push notifications and renew expiring ones"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--all",
+            action="store_true",
+            help="Subscribe every channel, not only the ones about to expire",
+        )
+
+    def handle(self, *args, **options):
+        if not websub.is_enabled():
+            self.stdout.write("WebSub is disabled, WEBSUB_CALLBACK_URL is not set")
+            return
+
+        channels = Channel.objects.all()
+        if not options["all"]:
+            channels = channels.websub_renewal_due()
+
+        subscribed = 0
+        for channel in channels.iterator():
+            try:
+                websub.subscribe(channel)
+            except requests.RequestException as exc:
+                self.stderr.write(f"{channel} ({channel.feed_url}): {exc!r}")
+            else:
+                subscribed += 1
+
+        self.stdout.write(f"Requested {subscribed} WebSub subscriptions")
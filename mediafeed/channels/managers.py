@@ -1,10 +1,92 @@
 import datetime
+import json
 
-from django.db import models
+from django.conf import settings
+from django.db import connection, models, transaction
+from django.db.models import F, Q
 from django.utils import timezone
 
 
-class VideoQuerySet(models.QuerySet):
+class ChannelQuerySet(models.QuerySet):
+    def due(self, now=None):
+        if now is None:
+            now = timezone.now()
+        return self.filter(
+            Q(next_sync_at__isnull=True) | Q(next_sync_at__lte=now),
+            parked_at__isnull=True,
+        )
+
+    def websub_renewal_due(self, now=None):
+        if now is None:
+            now = timezone.now()
+        renew_before = now + datetime.timedelta(seconds=settings.WEBSUB_RENEW_MARGIN)
+        return self.filter(
+            Q(websub_expires_at__isnull=True) | Q(websub_expires_at__lte=renew_before),
+            parked_at__isnull=True,
+        )
+
+    def unleased(self, now=None):
+        if now is None:
+            now = timezone.now()
+        # An expired lease belongs to a worker that died or overran
+        # SYNC_LEASE_TIMEOUT, so its channels are handed out again
+        return self.filter(
+            Q(lease_expires_at__isnull=True) | Q(lease_expires_at__lte=now)
+        )
+
+    def claim(self, owner, limit, now=None):
+        if now is None:
+            now = timezone.now()
+        expires_at = now + datetime.timedelta(seconds=settings.SYNC_LEASE_TIMEOUT)
+        candidates = self.due(now).unleased(now).order_by("next_sync_at", "id")
+        if not connection.features.has_select_for_update_skip_locked:
+            # Engines without SKIP LOCKED (SQLite) serialize writes. Reading
+            # the candidates first would take a read lock that cannot be
+            # upgraded while another worker writes, failing with "database is
+            # locked", so they are claimed in a single statement that waits
+            # for the write lock instead
+            self.filter(pk__in=candidates.values("pk")[:limit]).unleased(now).update(
+                lease_owner=owner, lease_expires_at=expires_at
+            )
+            return list(
+                self.filter(lease_owner=owner, lease_expires_at=expires_at).order_by(
+                    "id"
+                )
+            )
+
+        with transaction.atomic():
+            # Rows being claimed by another worker are skipped instead of
+            # waiting for its transaction to finish
+            candidates = candidates.select_for_update(skip_locked=True)
+            pks = list(candidates.values_list("pk", flat=True)[:limit])
+            self.filter(pk__in=pks).unleased(now).update(
+                lease_owner=owner, lease_expires_at=expires_at
+            )
+        return list(self.filter(pk__in=pks, lease_owner=owner).order_by("id"))
+
+    def renew(self, owner, now=None):
+        if now is None:
+            now = timezone.now()
+        expires_at = now + datetime.timedelta(seconds=settings.SYNC_LEASE_TIMEOUT)
+        return self.filter(lease_owner=owner).update(lease_expires_at=expires_at)
+
+    def release(self, owner):
+        return self.filter(lease_owner=owner).update(
+            lease_owner="", lease_expires_at=None
+        )
+
+    def claim_all(self, owner, batch_size):
+        while True:
+            channels = self.claim(owner, batch_size)
+            if not channels:
+                return
+            # Channels claimed before may still wait to be fetched or stored
+            # with their batch, so their leases are renewed with every claim
+            self.renew(owner)
+            yield from channels
+
+
+class PublishedQuerySet(models.QuerySet):
     def last_24h(self):
         start_datetime = timezone.now() - datetime.timedelta(hours=24, minutes=1)
         return self.filter(published_date__gte=start_datetime)
@@ -13,5 +95,99 @@ class VideoQuerySet(models.QuerySet):
         start_datetime = timezone.now() - datetime.timedelta(days=7, minutes=1)
         return self.filter(published_date__gte=start_datetime)
 
+    def for_period(self, period):
+        # Anything but "all" and "week" is the last 24 hours
+        if period == "all":
+            return self.all()
+        if period == "week":
+            return self.last_week()
+        return self.last_24h()
+
+
+class VideoQuerySet(PublishedQuerySet):
     def for_categories(self, categories):
         return self.filter(channel__categories__in=categories)
+
+    def for_timeline(self):
+        # Only what the video cards render, with the channel joined
+        return self.select_related("channel").only(
+            "url",
+            "title",
+            "thumbnail_image",
+            "published_date",
+            "channel__url",
+            "channel__title",
+        )
+
+
+class TimelineEntryQuerySet(PublishedQuerySet):
+    def for_timeline(self):
+        return self.select_related("video__channel").only(
+            "published_date",
+            "video__url",
+            "video__title",
+            "video__thumbnail_image",
+            "video__published_date",
+            "video__channel__url",
+            "video__channel__title",
+        )
+
+    def add_videos(self, category_ids, videos):
+        """Add (pk, published_date) videos to the timelines of category_ids."""
+        return self.bulk_create(
+            [
+                self.model(
+                    category_id=category_id,
+                    video_id=video_pk,
+                    published_date=published_date,
+                )
+                for category_id in category_ids
+                for video_pk, published_date in videos
+            ],
+            batch_size=1000,
+            ignore_conflicts=True,
+        )
+
+    def add_channels(self, category_ids, channel_ids):
+        from channels.models import Video
+
+        videos = Video.objects.filter(channel_id__in=channel_ids).values_list(
+            "pk", "published_date"
+        )
+        return self.add_videos(category_ids, videos)
+
+
+class JobQuerySet(models.QuerySet):
+    def enqueue(self, kind, user=None, category=None, **payload):
+        return self.create(
+            kind=kind, user=user, category=category, payload=json.dumps(payload)
+        )
+
+    def claimable(self, now=None):
+        if now is None:
+            now = timezone.now()
+        # Jobs left running for longer than JOB_TIMEOUT belong to a worker
+        # that died, so they are picked up again
+        stale = now - datetime.timedelta(seconds=settings.JOB_TIMEOUT)
+        return self.filter(
+            Q(status=self.model.PENDING, run_after__lte=now)
+            | Q(status=self.model.RUNNING, started_at__lt=stale)
+        )
+
+    def claim(self):
+        now = timezone.now()
+        for job in self.claimable(now).order_by("run_after", "id")[:10]:
+            # Only one worker wins the conditional update of a job
+            claimed = (
+                self.claimable(now)
+                .filter(pk=job.pk)
+                .update(
+                    status=self.model.RUNNING,
+                    started_at=now,
+                    attempts=F("attempts") + 1,
+                )
+            )
+            if claimed:
+                job.refresh_from_db()
+                return job
+        return None
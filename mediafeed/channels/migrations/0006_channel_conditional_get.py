@@ -0,0 +1,28 @@
+# Generated by Django 3.2.25 on 2026-10-18 09:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("channels", "0005_auto_20200706_2331"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="channel",
+            name="etag",
+            field=models.CharField(blank=True, max_length=255),
+        ),
+        migrations.AddField(
+            model_name="channel",
+            name="feed_hash",
+            field=models.CharField(blank=True, max_length=64),
+        ),
+        migrations.AddField(
+            model_name="channel",
+            name="last_modified",
+            field=models.CharField(blank=True, max_length=255),
+        ),
+    ]
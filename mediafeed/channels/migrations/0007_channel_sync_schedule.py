@@ -0,0 +1,23 @@
+# Generated by Django 3.2.25 on 2026-10-18 09:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("channels", "0006_channel_conditional_get"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="channel",
+            name="next_sync_at",
+            field=models.DateTimeField(blank=True, db_index=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="channel",
+            name="sync_interval",
+            field=models.DurationField(blank=True, null=True),
+        ),
+    ]
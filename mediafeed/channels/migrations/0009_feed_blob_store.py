@@ -0,0 +1,33 @@
+# Generated by Django 3.2.25 on 2026-10-18 09:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("channels", "0008_job"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="FeedBlob",
+            fields=[
+                (
+                    "digest",
+                    models.CharField(max_length=64, primary_key=True, serialize=False),
+                ),
+                ("data", models.BinaryField()),
+            ],
+        ),
+        migrations.AddField(
+            model_name="feed",
+            name="digest",
+            field=models.CharField(blank=True, max_length=64),
+        ),
+        migrations.AlterField(
+            model_name="feed",
+            name="feed",
+            field=models.TextField(blank=True),
+        ),
+    ]
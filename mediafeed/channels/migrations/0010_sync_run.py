@@ -0,0 +1,85 @@
+# Generated by Django 3.2.25 on 2026-10-18 09:45
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("channels", "0009_feed_blob_store"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SyncRun",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("started_at", models.DateTimeField(db_index=True)),
+                ("elapsed", models.FloatField(default=0)),
+                ("workers", models.PositiveIntegerField(default=1)),
+                ("channels", models.PositiveIntegerField(default=0)),
+                ("new_videos", models.PositiveIntegerField(default=0)),
+                ("unchanged", models.PositiveIntegerField(default=0)),
+                ("failures", models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                "verbose_name": "sync run",
+                "verbose_name_plural": "sync runs",
+                "ordering": ["-started_at"],
+            },
+        ),
+        migrations.CreateModel(
+            name="SyncRunChannel",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("status_code", models.PositiveSmallIntegerField(null=True)),
+                ("response_size", models.PositiveIntegerField(default=0)),
+                ("wait_time", models.FloatField(default=0)),
+                ("download_time", models.FloatField(default=0)),
+                ("parse_time", models.FloatField(default=0)),
+                ("ingest_time", models.FloatField(default=0)),
+                ("entries", models.PositiveIntegerField(default=0)),
+                ("new_videos", models.PositiveIntegerField(default=0)),
+                ("skipped", models.PositiveIntegerField(default=0)),
+                ("error", models.TextField(blank=True)),
+                (
+                    "channel",
+                    models.ForeignKey(
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="sync_results",
+                        to="channels.channel",
+                    ),
+                ),
+                (
+                    "run",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="results",
+                        to="channels.syncrun",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "sync run channel",
+                "verbose_name_plural": "sync run channels",
+            },
+        ),
+    ]
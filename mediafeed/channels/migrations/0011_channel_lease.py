@@ -0,0 +1,23 @@
+# Generated by Django 3.2.25 on 2026-10-18 09:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("channels", "0010_sync_run"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="channel",
+            name="lease_expires_at",
+            field=models.DateTimeField(blank=True, db_index=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="channel",
+            name="lease_owner",
+            field=models.CharField(blank=True, max_length=255),
+        ),
+    ]
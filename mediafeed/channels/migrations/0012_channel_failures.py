@@ -0,0 +1,33 @@
+# Generated by Django 3.2.25 on 2026-10-18 09:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("channels", "0011_channel_lease"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="channel",
+            name="failure_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="channel",
+            name="last_error",
+            field=models.TextField(blank=True),
+        ),
+        migrations.AddField(
+            model_name="channel",
+            name="last_error_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="channel",
+            name="parked_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 3.2.25 on 2026-10-18 09:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("channels", "0012_channel_failures"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="channel",
+            name="watermark_published_date",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="channel",
+            name="watermark_video_id",
+            field=models.CharField(blank=True, max_length=20),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 3.2.25 on 2026-10-18 09:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("channels", "0013_channel_watermark"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="channel",
+            name="websub_expires_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
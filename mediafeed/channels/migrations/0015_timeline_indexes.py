@@ -0,0 +1,24 @@
+# Generated by Django 3.2.25 on 2026-10-18 09:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("channels", "0014_channel_websub"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="category",
+            index=models.Index(fields=["user", "slug"], name="category_user_slug_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="video",
+            index=models.Index(
+                fields=["channel", "-published_date"],
+                name="video_channel_published_idx",
+            ),
+        ),
+    ]
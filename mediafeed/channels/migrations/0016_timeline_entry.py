@@ -0,0 +1,83 @@
+# Generated by Django 3.2.25 on 2026-10-18 09:54
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def fill_timelines(apps, schema_editor):
+    Category = apps.get_model("channels", "Category")
+    TimelineEntry = apps.get_model("channels", "TimelineEntry")
+    Video = apps.get_model("channels", "Video")
+
+    for category in Category.objects.iterator():
+        videos = Video.objects.filter(channel__categories=category).values_list(
+            "pk", "published_date"
+        )
+        TimelineEntry.objects.bulk_create(
+            [
+                TimelineEntry(
+                    category=category, video_id=pk, published_date=published_date
+                )
+                for pk, published_date in videos.iterator()
+            ],
+            batch_size=1000,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("channels", "0015_timeline_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TimelineEntry",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("published_date", models.DateTimeField()),
+                (
+                    "category",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="timeline",
+                        to="channels.category",
+                    ),
+                ),
+                (
+                    "video",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="timeline_entries",
+                        to="channels.video",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "timeline entry",
+                "verbose_name_plural": "timeline entries",
+            },
+        ),
+        migrations.AddIndex(
+            model_name="timelineentry",
+            index=models.Index(
+                fields=["category", "-published_date", "video"],
+                name="timeline_category_date_idx",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="timelineentry",
+            constraint=models.UniqueConstraint(
+                fields=("category", "video"), name="timeline_category_video_unique"
+            ),
+        ),
+        migrations.RunPython(fill_timelines, migrations.RunPython.noop),
+    ]
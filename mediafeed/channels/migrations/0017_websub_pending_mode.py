@@ -0,0 +1,18 @@
+# Generated by Django 3.2.25 on 2026-10-18 10:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("channels", "0016_timeline_entry"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="channel",
+            name="websub_pending_mode",
+            field=models.CharField(blank=True, max_length=20),
+        ),
+    ]
@@ -0,0 +1,27 @@
+from django.db import migrations
+
+from channels.feeds import entry_from_json
+
+
+def convert_json_entries(apps, schema_editor):
+    Feed = apps.get_model("channels", "Feed")
+
+    feeds = []
+    for feed in Feed.objects.filter(feed__startswith="{").only("feed").iterator():
+        feed.feed = entry_from_json(feed.feed)
+        feeds.append(feed)
+        if len(feeds) >= 1000:
+            Feed.objects.bulk_update(feeds, ["feed"])
+            feeds = []
+    Feed.objects.bulk_update(feeds, ["feed"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("channels", "0017_websub_pending_mode"),
+    ]
+
+    operations = [
+        migrations.RunPython(convert_json_entries, migrations.RunPython.noop),
+    ]
@@ -1,24 +1,75 @@
+import datetime
+import hashlib
 import json
 import re
+import time
 from urllib.parse import urlencode
 
-import dateparser
-import requests
-import xmltodict
 from django.conf import settings
 from django.contrib.auth.models import User
+from django.core.exceptions import ImproperlyConfigured
 from django.db import models
+from django.utils import timezone
+from django.utils.functional import cached_property
 from django.utils.text import slugify
 from parsel import Selector
 
-from channels.managers import VideoQuerySet
-from channels.utils import get_channel_feed_url, get_channel_title
+from channels.blobs import get_blob_store
+from channels.feeds import entry_from_json, parse_feed
+from channels.http import get_http_client
+from channels.managers import (
+    ChannelQuerySet,
+    JobQuerySet,
+    TimelineEntryQuerySet,
+    VideoQuerySet,
+)
+from channels.utils import (
+    get_channel_feed_url,
+    get_channel_title,
+    get_failure_backoff,
+    get_sync_interval,
+)
 
 
 class Channel(models.Model):
     title = models.CharField(max_length=255)
     url = models.URLField()
     feed_url = models.URLField()
+    etag = models.CharField(max_length=255, blank=True)
+    last_modified = models.CharField(max_length=255, blank=True)
+    feed_hash = models.CharField(max_length=64, blank=True)
+    sync_interval = models.DurationField(null=True, blank=True)
+    next_sync_at = models.DateTimeField(null=True, blank=True, db_index=True)
+    lease_owner = models.CharField(max_length=255, blank=True)
+    lease_expires_at = models.DateTimeField(null=True, blank=True, db_index=True)
+    watermark_published_date = models.DateTimeField(null=True, blank=True)
+    watermark_video_id = models.CharField(max_length=20, blank=True)
+    websub_expires_at = models.DateTimeField(null=True, blank=True)
+    websub_pending_mode = models.CharField(max_length=20, blank=True)
+    failure_count = models.PositiveIntegerField(default=0)
+    last_error = models.TextField(blank=True)
+    last_error_at = models.DateTimeField(null=True, blank=True)
+    parked_at = models.DateTimeField(null=True, blank=True)
+
+    objects = ChannelQuerySet.as_manager()
+
+    SYNC_FIELDS = [
+        "etag",
+        "last_modified",
+        "feed_hash",
+        "sync_interval",
+        "next_sync_at",
+        "watermark_published_date",
+        "watermark_video_id",
+        "failure_count",
+    ]
+    FAILURE_FIELDS = [
+        "failure_count",
+        "last_error",
+        "last_error_at",
+        "parked_at",
+        "next_sync_at",
+    ]
 
     class Meta:
         verbose_name = "channel"
@@ -28,31 +79,117 @@ class Channel(models.Model):
         return self.title
 
     def save(self, *args, **kwargs):
+        self.fetch_metadata()
+        super().save(*args, **kwargs)
+
+    def fetch_metadata(self):
         if not self.title:
             self.title = get_channel_title(self.url)
 
         if not self.feed_url:
             self.feed_url = get_channel_feed_url(self.url)
 
-        super().save(*args, **kwargs)
+    def fetch_feed(self, stats=None):
+        # stats, when given, is filled with the status code, size and phase
+        # timings (in seconds) of the fetch. wait_time is the time until the
+        # response headers arrived, DNS, connection setup and retries included.
+        if stats is None:
+            stats = {}
+
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+
+        started = time.perf_counter()
+        response = get_http_client().get(self.feed_url, headers=headers)
+        stats["status_code"] = response.status_code
+        stats["response_size"] = len(response.content)
+        stats["wait_time"] = response.elapsed.total_seconds()
+        stats["download_time"] = max(
+            0.0, time.perf_counter() - started - stats["wait_time"]
+        )
+        if response.status_code == 304:
+            return None
+        response.raise_for_status()
+
+        self.etag = response.headers.get("ETag", "")
+        self.last_modified = response.headers.get("Last-Modified", "")
+
+        feed_hash = hashlib.sha256(response.content).hexdigest()
+        if feed_hash == self.feed_hash:
+            return None
+
+        self.feed_hash = feed_hash
+        started = time.perf_counter()
+        entries = list(parse_feed(response.content, watermark=self.watermark))
+        stats["parse_time"] = time.perf_counter() - started
+        stats["entries"] = len(entries)
+        return entries
 
     def sync_videos(self):
-        response = requests.get(self.feed_url)
-        channel_feed = xmltodict.parse(response.text)
-
-        existing_videos = list(Video.objects.all().values_list("video_id", flat=True))
-        latest_videos = channel_feed["feed"]["entry"]
-        for entry in latest_videos:
-            video_id = entry["yt:videoId"]
-            if video_id not in existing_videos:
-                video = Video.objects.create(
-                    url=entry["link"]["@href"],
-                    title=entry["title"],
-                    channel=self,
-                    thumbnail_image=entry["media:group"]["media:thumbnail"]["@url"],
-                    published_date=dateparser.parse(entry["published"]),
-                )
-                Feed.objects.create(video=video, feed=json.dumps(entry))
+        return self.ingest_feed(self.fetch_feed())
+
+    def ingest_feed(self, entries):
+        from channels.ingest import ingest_feeds
+
+        # The validators set by fetch_feed are only persisted once the feed
+        # has been ingested, so a failed run fetches the whole feed again.
+        return ingest_feeds([(self, entries)])[0]
+
+    @property
+    def watermark(self):
+        if self.watermark_published_date is None:
+            return None
+        return (self.watermark_published_date, self.watermark_video_id)
+
+    def advance_watermark(self, entries):
+        if not entries:
+            return
+        newest = max(entries, key=lambda entry: entry.published_date)
+        if self.watermark is None or newest.published_date > self.watermark[0]:
+            self.watermark_published_date = newest.published_date
+            self.watermark_video_id = newest.video_id
+
+    def schedule_next_sync(self, new_videos):
+        published_dates = self.videos.order_by("-published_date").values_list(
+            "published_date", flat=True
+        )[: settings.SYNC_HISTORY_SIZE]
+        self.sync_interval = get_sync_interval(
+            published_dates,
+            previous_interval=self.sync_interval,
+            new_videos=bool(new_videos),
+        )
+        now = timezone.now()
+        next_sync_interval = self.sync_interval
+        if self.websub_expires_at and self.websub_expires_at > now:
+            # New videos are pushed by the hub, polling is only a fallback
+            next_sync_interval = max(
+                next_sync_interval,
+                datetime.timedelta(seconds=settings.WEBSUB_FALLBACK_INTERVAL),
+            )
+        self.next_sync_at = now + next_sync_interval
+        self.failure_count = 0
+
+    def record_failure(self, error):
+        # Consecutive failures push the next sync further away, and after
+        # SYNC_MAX_FAILURES of them the channel is parked: it is no longer
+        # due until someone unparks it
+        now = timezone.now()
+        self.failure_count += 1
+        self.last_error = error
+        self.last_error_at = now
+        self.next_sync_at = now + get_failure_backoff(self.failure_count)
+        if self.failure_count >= settings.SYNC_MAX_FAILURES:
+            self.parked_at = now
+        self.save(update_fields=self.FAILURE_FIELDS)
+
+    def unpark(self):
+        self.failure_count = 0
+        self.parked_at = None
+        self.next_sync_at = None
+        self.save(update_fields=self.FAILURE_FIELDS)
 
 
 class Video(models.Model):
@@ -73,6 +210,12 @@ class Video(models.Model):
     class Meta:
         verbose_name = "video"
         verbose_name_plural = "videos"
+        indexes = [
+            models.Index(
+                fields=["channel", "-published_date"],
+                name="video_channel_published_idx",
+            ),
+        ]
 
     def __str__(self):
         return self.title
@@ -99,6 +242,9 @@ class Category(models.Model):
     class Meta:
         verbose_name = "category"
         verbose_name_plural = "categories"
+        indexes = [
+            models.Index(fields=["user", "slug"], name="category_user_slug_idx"),
+        ]
 
     def __str__(self):
         return self.title
@@ -116,6 +262,208 @@ class Category(models.Model):
         )
 
 
+class TimelineEntry(models.Model):
+    category = models.ForeignKey(
+        Category, on_delete=models.CASCADE, related_name="timeline"
+    )
+    video = models.ForeignKey(
+        Video, on_delete=models.CASCADE, related_name="timeline_entries"
+    )
+    # Copied from the video, so a page of a category timeline is a single
+    # range scan of the (category, published_date) index
+    published_date = models.DateTimeField()
+
+    objects = TimelineEntryQuerySet.as_manager()
+
+    class Meta:
+        verbose_name = "timeline entry"
+        verbose_name_plural = "timeline entries"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["category", "video"], name="timeline_category_video_unique"
+            ),
+        ]
+        indexes = [
+            models.Index(
+                fields=["category", "-published_date", "video"],
+                name="timeline_category_date_idx",
+            ),
+        ]
+
+
 class Feed(models.Model):
     video = models.OneToOneField(Video, on_delete=models.CASCADE)
-    feed = models.TextField()
+    feed = models.TextField(blank=True)
+    digest = models.CharField(max_length=64, blank=True)
+
+    @classmethod
+    def build_many(cls, entries):
+        """Build unsaved Feed rows from (video_id, raw entry) pairs.
+
+        With a FEED_BLOB_STORE configured the raw entries go to the store and
+        the rows only keep their digests.
+        """
+        store = get_blob_store()
+        if store is None:
+            return [cls(video_id=video_id, feed=raw) for video_id, raw in entries]
+
+        digests = store.put_many([raw for _, raw in entries])
+        return [
+            cls(video_id=video_id, digest=digest)
+            for (video_id, _), digest in zip(entries, digests)
+        ]
+
+    @cached_property
+    def content(self):
+        if self.digest:
+            store = get_blob_store()
+            if store is None:
+                raise ImproperlyConfigured(
+                    f"Feed {self.pk} is kept in a blob store, but FEED_BLOB_STORE "
+                    "is not set"
+                )
+            content = store.get(self.digest)
+        else:
+            content = self.feed
+        # Blobs are never rewritten, so old JSON entries are converted here
+        if content.startswith("{"):
+            return entry_from_json(content)
+        return content
+
+
+class FeedBlob(models.Model):
+    digest = models.CharField(max_length=64, primary_key=True)
+    data = models.BinaryField()
+
+
+class Job(models.Model):
+    PENDING = "pending"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+    STATUS_CHOICES = [
+        (PENDING, "Pending"),
+        (RUNNING, "Running"),
+        (DONE, "Done"),
+        (FAILED, "Failed"),
+    ]
+
+    kind = models.CharField(max_length=50)
+    payload = models.TextField(default="{}")
+    status = models.CharField(
+        max_length=20, choices=STATUS_CHOICES, default=PENDING, db_index=True
+    )
+    attempts = models.PositiveIntegerField(default=0)
+    error = models.TextField(blank=True)
+    user = models.ForeignKey(User, null=True, blank=True, on_delete=models.CASCADE)
+    category = models.ForeignKey(
+        Category, null=True, blank=True, on_delete=models.CASCADE
+    )
+    channel = models.ForeignKey(
+        Channel, null=True, blank=True, on_delete=models.SET_NULL
+    )
+    run_after = models.DateTimeField(default=timezone.now)
+    started_at = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = JobQuerySet.as_manager()
+
+    class Meta:
+        verbose_name = "job"
+        verbose_name_plural = "jobs"
+
+    def __str__(self):
+        return f"{self.kind} ({self.status})"
+
+    @property
+    def data(self):
+        return json.loads(self.payload)
+
+    def finish(self):
+        self.status = self.DONE
+        self.error = ""
+        self.save()
+
+    def fail(self, error):
+        self.error = repr(error)
+        if self.attempts < settings.JOB_MAX_ATTEMPTS:
+            self.status = self.PENDING
+            self.run_after = timezone.now() + datetime.timedelta(
+                seconds=settings.JOB_RETRY_DELAY * 2 ** (self.attempts - 1)
+            )
+        else:
+            self.status = self.FAILED
+        self.save()
+
+
+class SyncRun(models.Model):
+    started_at = models.DateTimeField(db_index=True)
+    elapsed = models.FloatField(default=0)
+    workers = models.PositiveIntegerField(default=1)
+    channels = models.PositiveIntegerField(default=0)
+    new_videos = models.PositiveIntegerField(default=0)
+    unchanged = models.PositiveIntegerField(default=0)
+    failures = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        verbose_name = "sync run"
+        verbose_name_plural = "sync runs"
+        ordering = ["-started_at"]
+
+    def __str__(self):
+        return f"Sync run at {self.started_at:%Y-%m-%d %H:%M}"
+
+    @classmethod
+    def record(cls, summary):
+        run = cls.objects.create(
+            started_at=summary.started_at,
+            elapsed=summary.elapsed,
+            workers=summary.workers,
+            channels=summary.channels,
+            new_videos=summary.new_videos,
+            unchanged=summary.unchanged,
+            failures=len(summary.failures),
+        )
+        SyncRunChannel.objects.bulk_create(
+            SyncRunChannel(
+                run=run,
+                channel=result.channel,
+                status_code=result.status_code,
+                response_size=result.response_size,
+                wait_time=result.wait_time,
+                download_time=result.download_time,
+                parse_time=result.parse_time,
+                ingest_time=result.ingest_time,
+                entries=result.entries,
+                new_videos=result.new_videos,
+                skipped=result.skipped,
+                error=result.error,
+            )
+            for result in summary.results
+        )
+        return run
+
+
+class SyncRunChannel(models.Model):
+    run = models.ForeignKey(SyncRun, on_delete=models.CASCADE, related_name="results")
+    channel = models.ForeignKey(
+        Channel,
+        null=True,
+        on_delete=models.SET_NULL,
+        related_name="sync_results",
+    )
+    status_code = models.PositiveSmallIntegerField(null=True)
+    response_size = models.PositiveIntegerField(default=0)
+    wait_time = models.FloatField(default=0)
+    download_time = models.FloatField(default=0)
+    parse_time = models.FloatField(default=0)
+    ingest_time = models.FloatField(default=0)
+    entries = models.PositiveIntegerField(default=0)
+    new_videos = models.PositiveIntegerField(default=0)
+    skipped = models.PositiveIntegerField(default=0)
+    error = models.TextField(blank=True)
+
+    class Meta:
+        verbose_name = "sync run channel"
+        verbose_name_plural = "sync run channels"
@@ -0,0 +1,217 @@
+import functools
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.http import HttpResponse
+from django.utils.cache import (
+    get_conditional_response,
+    patch_cache_control,
+    set_response_etag,
+)
+from django.utils.http import http_date, quote_etag, urlencode
+
+from channels.pagination import decode_cursor, get_page_size
+
+# Rendered timelines of anonymous visitors are cached under the versions of
+# what they show, read before rendering:
+#
+# - the videos of one category (category_details)
+# - the videos of all categories of a user (user_details)
+# - the list of categories of a user, with their titles and visibility
+#
+# Any change bumps the versions involved, so cached pages are never served
+# stale and a hit costs no database query. Pages of the last 24 hours or week
+# also change as time passes, so they are keyed by a time window of
+# TIMELINE_MAX_AGE seconds as well. The versions are also the ETag of
+# the page, so a client that already has it gets a 304 without the page
+# being read from the cache at all.
+
+
+def get_cache():
+    return caches[settings.TIMELINE_CACHE]
+
+
+def category_key(username, slug):
+    return f"timeline-version:category:{username}:{slug}"
+
+
+def user_key(username):
+    return f"timeline-version:user:{username}"
+
+
+def categories_key(username):
+    return f"timeline-version:categories:{username}"
+
+
+def get_versions(keys):
+    cache = get_cache()
+    versions = cache.get_many(keys)
+    missing = [key for key in keys if key not in versions]
+    if missing:
+        # A version that was evicted starts over from a new, unique value,
+        # never from one a cached page could have been stored with
+        for key in missing:
+            cache.add(key, time.time_ns(), timeout=None)
+        versions.update(cache.get_many(missing))
+    return [versions.get(key) for key in keys]
+
+
+def bump_versions(keys):
+    cache = get_cache()
+    for key in keys:
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, time.time_ns(), timeout=None)
+
+
+def invalidate_categories(categories, list_changed=False):
+    """Bump the versions of (username, slug) categories once committed."""
+    keys = set()
+    for username, slug in categories:
+        keys.update([category_key(username, slug), user_key(username)])
+        if list_changed:
+            keys.add(categories_key(username))
+    if keys:
+        # Bumping before the commit would let a concurrent request cache the
+        # old rows under the new version
+        transaction.on_commit(lambda: bump_versions(sorted(keys)))
+
+
+def invalidate_category_ids(category_ids):
+    from channels.models import Category
+
+    if category_ids:
+        invalidate_categories(
+            Category.objects.filter(pk__in=category_ids).values_list(
+                "user__username", "slug"
+            )
+        )
+
+
+def cache_streamed(page_key, cached, chunks):
+    content = []
+    for chunk in chunks:
+        content.append(chunk)
+        yield chunk
+    # Only pages that were sent in full are cached
+    get_cache().set(page_key, {**cached, "content": b"".join(content)})
+
+
+def make_public(response):
+    # Anonymous visitors only ever see public categories
+    patch_cache_control(response, public=True, max_age=settings.TIMELINE_MAX_AGE)
+    return response
+
+
+def get_time_window():
+    return int(time.time()) // max(1, settings.TIMELINE_MAX_AGE)
+
+
+def get_timeline_params(request):
+    # The key only depends on the parameters the views use, as they use them
+    params = {"page_size": get_page_size(request.GET.get("page_size"))}
+    period = request.GET.get("period")
+    params["period"] = period if period in ("all", "week") else "last_24h"
+    if params["period"] != "all":
+        params["window"] = get_time_window()
+    before = request.GET.get("before")
+    if before and decode_cursor(before) is not None:
+        params["before"] = before
+    return params
+
+
+def get_page_key(request, get_params=get_timeline_params):
+    page = f"{request.path}?{urlencode(sorted(get_params(request).items()))}"
+    return "timeline-page:" + hashlib.md5(page.encode()).hexdigest()
+
+
+def cache_timeline_page(view, get_params=get_timeline_params):
+    @functools.wraps(view)
+    def wrapper(request, username, **kwargs):
+        if request.method not in ("GET", "HEAD"):
+            return view(request, username, **kwargs)
+        if request.user.is_authenticated:
+            response = view(request, username, **kwargs)
+            patch_cache_control(response, private=True)
+            return response
+
+        if "slug" in kwargs:
+            keys = [category_key(username, kwargs["slug"]), categories_key(username)]
+        else:
+            keys = [user_key(username), categories_key(username)]
+        versions = get_versions(keys)
+        page_key = get_page_key(request, get_params)
+
+        # The page key holds the time window of relative periods, so their
+        # ETag changes when videos can have left the period
+        etag = None
+        if None not in versions:
+            etag = quote_etag(
+                hashlib.md5(f"{page_key}:{versions}".encode()).hexdigest()
+            )
+            not_modified = get_conditional_response(request, etag=etag)
+            if not_modified is not None and not_modified.status_code == 304:
+                not_modified["ETag"] = etag
+                return make_public(not_modified)
+
+        cache = get_cache()
+        cached = cache.get(page_key)
+        # Entries stored without last_modified, by older code, are misses
+        if (
+            cached is not None
+            and cached["versions"] == versions
+            and cached.get("last_modified") is not None
+        ):
+            response = HttpResponse(
+                cached["content"], content_type=cached["content_type"]
+            )
+            last_modified = cached["last_modified"]
+        else:
+            response = view(request, username, **kwargs)
+            if response.status_code != 200:
+                return response
+            last_modified = int(time.time())
+            cached = {
+                "versions": versions,
+                "content_type": response["Content-Type"],
+                "last_modified": last_modified,
+            }
+            if response.streaming:
+                response.streaming_content = cache_streamed(
+                    page_key, cached, response.streaming_content
+                )
+            else:
+                cache.set(page_key, {**cached, "content": response.content})
+
+        if etag is None:
+            # Versions are not kept by this cache backend, so the page itself
+            # is the only validator. Only feeds are streamed, and they are
+            # bounded by SYNDICATION_FEED_SIZE, so they can be read to hash
+            if response.streaming:
+                response = HttpResponse(
+                    b"".join(response.streaming_content),
+                    content_type=response["Content-Type"],
+                )
+            set_response_etag(response)
+            last_modified = None
+        else:
+            response["ETag"] = etag
+            response["Last-Modified"] = http_date(last_modified)
+        make_public(response)
+        return get_conditional_response(
+            request,
+            etag=response.get("ETag"),
+            last_modified=last_modified,
+            response=response,
+        )
+
+    return wrapper
+
+
+def cache_feed(view):
+    # Feeds always list the newest videos, whatever the query string
+    return cache_timeline_page(view, get_params=lambda request: {})
@@ -0,0 +1,109 @@
+import base64
+import binascii
+import datetime
+import heapq
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.db.models import Q
+
+
+@dataclass
+class KeysetPage:
+    items: list
+    next_cursor: str = None
+
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+
+def encode_cursor(published_date, pk):
+    value = f"{published_date.isoformat()}|{pk}"
+    return base64.urlsafe_b64encode(value.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor):
+    try:
+        value = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        published_date, pk = value.split("|")
+        return datetime.datetime.fromisoformat(published_date), int(pk)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        return None
+
+
+def get_page_size(value):
+    try:
+        page_size = int(value)
+    except (TypeError, ValueError):
+        return settings.TIMELINE_PAGE_SIZE
+    return max(1, min(page_size, settings.TIMELINE_MAX_PAGE_SIZE))
+
+
+def after_cursor(queryset, cursor, tiebreaker):
+    position = decode_cursor(cursor) if cursor else None
+    if position is not None:
+        published_date, pk = position
+        queryset = queryset.filter(
+            Q(published_date__lt=published_date)
+            | Q(published_date=published_date, **{f"{tiebreaker}__gt": pk})
+        )
+    return queryset.order_by("-published_date", tiebreaker)
+
+
+def make_page(items, page_size, tiebreaker):
+    if len(items) > page_size:
+        items = items[:page_size]
+        last = items[-1]
+        return KeysetPage(
+            items, encode_cursor(last.published_date, getattr(last, tiebreaker))
+        )
+    return KeysetPage(items)
+
+
+def paginate(queryset, cursor=None, page_size=None, tiebreaker="pk"):
+    """Return the page of queryset, newest first, that follows cursor.
+
+    Pages are selected by (published_date, tiebreaker) instead of an offset,
+    so every page costs the same as the first one. Invalid cursors start from
+    the top.
+    """
+    if page_size is None:
+        page_size = settings.TIMELINE_PAGE_SIZE
+
+    items = list(after_cursor(queryset, cursor, tiebreaker)[: page_size + 1])
+    return make_page(items, page_size, tiebreaker)
+
+
+def paginate_merged(querysets, cursor=None, page_size=None, tiebreaker="pk"):
+    """Like paginate, for the union of querysets without duplicates.
+
+    Each queryset only reads the next page_size + 1 rows of its own index
+    range, and the sorted results are merged here. Rows are duplicates when
+    they have the same tiebreaker value.
+    """
+    if page_size is None:
+        page_size = settings.TIMELINE_PAGE_SIZE
+
+    scans = [
+        list(after_cursor(queryset, cursor, tiebreaker)[: page_size + 1])
+        for queryset in querysets
+    ]
+    merged = heapq.merge(
+        *scans,
+        key=lambda item: (item.published_date, -getattr(item, tiebreaker)),
+        reverse=True,
+    )
+
+    items = []
+    seen = set()
+    for item in merged:
+        key = getattr(item, tiebreaker)
+        if key in seen:
+            continue
+        seen.add(key)
+        items.append(item)
+        if len(items) > page_size:
+            break
+
+    return make_page(items, page_size, tiebreaker)
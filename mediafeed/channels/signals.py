@@ -0,0 +1,88 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from channels.models import Category, Channel, TimelineEntry, Video
+from channels.page_cache import invalidate_categories, invalidate_category_ids
+
+
+def get_category_ids(channel_id):
+    return list(
+        Category.channels.through.objects.filter(channel_id=channel_id).values_list(
+            "category_id", flat=True
+        )
+    )
+
+
+@receiver(post_save, sender=Video)
+def update_timelines_of_video(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    category_ids = get_category_ids(instance.channel_id)
+    if created:
+        TimelineEntry.objects.add_videos(
+            category_ids, [(instance.pk, instance.published_date)]
+        )
+    else:
+        TimelineEntry.objects.filter(video=instance).update(
+            published_date=instance.published_date
+        )
+    invalidate_category_ids(category_ids)
+
+
+@receiver(post_delete, sender=Video)
+def invalidate_timelines_of_video(sender, instance, **kwargs):
+    invalidate_category_ids(get_category_ids(instance.channel_id))
+
+
+@receiver(post_save, sender=Channel)
+def invalidate_timelines_of_channel(
+    sender, instance, created, update_fields=None, raw=False, **kwargs
+):
+    # Pages show the title and url of channels. Syncs only save their own
+    # fields, and any other save may have changed them
+    if raw or created:
+        return
+    if update_fields is not None and not {"title", "url"} & set(update_fields):
+        return
+    invalidate_category_ids(get_category_ids(instance.pk))
+
+
+@receiver(pre_delete, sender=Channel)
+def invalidate_timelines_of_deleted_channel(sender, instance, **kwargs):
+    # Its memberships and timeline entries are deleted by cascade, without
+    # m2m_changed, so its categories are read before they are gone
+    invalidate_category_ids(get_category_ids(instance.pk))
+
+
+@receiver(m2m_changed, sender=Category.channels.through)
+def update_timelines_of_categories(sender, instance, action, reverse, pk_set, **kwargs):
+    # reverse is True when the change was made from the channel side, as in
+    # channel.category.add(category)
+    if reverse:
+        category_ids, channel_ids = pk_set, {instance.pk}
+    else:
+        category_ids, channel_ids = {instance.pk}, pk_set
+
+    if action == "post_add":
+        TimelineEntry.objects.add_channels(category_ids, channel_ids)
+    elif action == "post_remove":
+        TimelineEntry.objects.filter(
+            category_id__in=category_ids, video__channel_id__in=channel_ids
+        ).delete()
+    elif action == "pre_clear":
+        if reverse:
+            category_ids = list(instance.category.values_list("pk", flat=True))
+            TimelineEntry.objects.filter(video__channel=instance).delete()
+        else:
+            TimelineEntry.objects.filter(category=instance).delete()
+    else:
+        return
+    invalidate_category_ids(category_ids)
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def invalidate_categories_of_user(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    invalidate_categories([(instance.user.username, instance.slug)], list_changed=True)
@@ -0,0 +1,152 @@
+import cProfile
+import logging
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from itertools import islice
+
+from django.utils import timezone
+
+from channels.ingest import ingest_feeds
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ChannelResult:
+    channel: object
+    status_code: int = None
+    response_size: int = 0
+    wait_time: float = 0.0
+    download_time: float = 0.0
+    parse_time: float = 0.0
+    ingest_time: float = 0.0
+    entries: int = 0
+    new_videos: int = 0
+    error: str = ""
+
+    @property
+    def skipped(self):
+        return self.entries - self.new_videos
+
+
+@dataclass
+class SyncSummary:
+    started_at: object = field(default_factory=timezone.now)
+    workers: int = 1
+    channels: int = 0
+    new_videos: int = 0
+    unchanged: int = 0
+    failures: list = field(default_factory=list)
+    results: list = field(default_factory=list)
+    profiles: list = field(default_factory=list)
+    elapsed: float = 0.0
+
+    @property
+    def channels_per_second(self):
+        if not self.elapsed:
+            return 0.0
+        return self.channels / self.elapsed
+
+    def __str__(self):
+        return (
+            f"Synced {self.channels} channels in {self.elapsed:.1f}s "
+            f"({self.channels_per_second:.1f} channels/s): "
+            f"{self.new_videos} new videos, {self.unchanged} unchanged, "
+            f"{len(self.failures)} failures"
+        )
+
+
+def sync_channels(channels, workers=1, batch_size=1, profile=False):
+    # Feeds are fetched and parsed by the worker threads, but every database
+    # write happens here, in the calling thread, batch_size channels per
+    # transaction. That keeps the threads free of DB connections and avoids
+    # racing on the unique video_id constraint.
+    #
+    # With profile=True every worker thread runs under its own profiler,
+    # collected in summary.profiles. Profiling the calling thread is up to
+    # the caller.
+    summary = SyncSummary(workers=workers)
+    started = time.monotonic()
+    channels = iter(channels)
+    batch = []
+    local = threading.local()
+
+    def fetch(channel):
+        if profile:
+            if not hasattr(local, "profiler"):
+                local.profiler = cProfile.Profile()
+                summary.profiles.append(local.profiler)
+            local.profiler.enable()
+
+        stats = {}
+        try:
+            return channel.fetch_feed(stats), stats, None
+        except Exception as exc:
+            return None, stats, exc
+        finally:
+            if profile:
+                local.profiler.disable()
+
+    def fail(result, exc):
+        logger.error("Failed to sync channel %s", result.channel.pk, exc_info=exc)
+        result.error = repr(exc)
+        result.channel.record_failure(result.error)
+        summary.failures.append((result.channel, exc))
+
+    def ingest(results):
+        ingest_started = time.perf_counter()
+        try:
+            new_videos = ingest_feeds(
+                [(result.channel, entries) for result, entries in results]
+            )
+        except Exception as exc:
+            if len(results) > 1:
+                # Retry one channel at a time so a single bad feed does not
+                # fail the whole batch
+                for result in results:
+                    ingest([result])
+            else:
+                fail(results[0][0], exc)
+            return
+
+        # A batch is written at once, so its time is split between channels
+        ingest_time = (time.perf_counter() - ingest_started) / len(results)
+        for (result, _), count in zip(results, new_videos):
+            result.ingest_time = ingest_time
+            result.new_videos = count
+            summary.new_videos += count
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        pending = {}
+
+        def submit(count):
+            for channel in islice(channels, count):
+                pending[executor.submit(fetch, channel)] = channel
+
+        submit(workers * 2)
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                entries, stats, exc = future.result()
+                result = ChannelResult(channel=pending.pop(future), **stats)
+                summary.results.append(result)
+                summary.channels += 1
+                if exc is not None:
+                    fail(result, exc)
+                    continue
+
+                if entries is None:
+                    summary.unchanged += 1
+                batch.append((result, entries))
+                if len(batch) >= batch_size:
+                    ingest(batch)
+                    batch = []
+            submit(len(done))
+
+    if batch:
+        ingest(batch)
+
+    summary.elapsed = time.monotonic() - started
+    return summary
@@ -0,0 +1,99 @@
+import io
+from itertools import chain
+
+from django.http import Http404, StreamingHttpResponse
+from django.utils import feedgenerator
+from django.utils.html import format_html
+from django.utils.xmlutils import SimplerXMLGenerator
+
+
+class StreamingFeedMixin:
+    """Write a feed in chunks, taking its items from an iterator.
+
+    The feed is flushed after its header and after every item, so only one
+    item at a time is in memory.
+    """
+
+    latest_date = None
+
+    def stream(self, items, encoding="utf-8"):
+        self.stream_items = iter(items)
+        first = next(self.stream_items, None)
+        if first is not None:
+            # Items come newest first, and the header needs the latest date
+            self.latest_date = first["pubdate"]
+            self.stream_items = chain([first], self.stream_items)
+
+        buffer = io.StringIO()
+        handler = SimplerXMLGenerator(buffer, encoding)
+        for _ in self.write_parts(handler):
+            yield buffer.getvalue().encode(encoding)
+            buffer.seek(0)
+            buffer.truncate()
+
+    def latest_post_date(self):
+        return self.latest_date or super().latest_post_date()
+
+    def write_item_parts(self, handler, element):
+        for item in self.stream_items:
+            handler.startElement(element, self.item_attributes(item))
+            self.add_item_elements(handler, item)
+            handler.endElement(element)
+            yield
+
+
+class AtomFeed(StreamingFeedMixin, feedgenerator.Atom1Feed):
+    def write_parts(self, handler):
+        handler.startDocument()
+        handler.startElement("feed", self.root_attributes())
+        self.add_root_elements(handler)
+        yield
+        yield from self.write_item_parts(handler, "entry")
+        handler.endElement("feed")
+        yield
+
+
+class RssFeed(StreamingFeedMixin, feedgenerator.Rss201rev2Feed):
+    def write_parts(self, handler):
+        handler.startDocument()
+        handler.startElement("rss", self.rss_attributes())
+        handler.startElement("channel", self.root_attributes())
+        self.add_root_elements(handler)
+        yield
+        yield from self.write_item_parts(handler, "item")
+        self.endChannelElement(handler)
+        handler.endElement("rss")
+        yield
+
+
+FEED_FORMATS = {"atom": AtomFeed, "rss": RssFeed}
+
+
+def get_feed_class(feed_format):
+    try:
+        return FEED_FORMATS[feed_format]
+    except KeyError:
+        raise Http404()
+
+
+def video_items(feed, videos):
+    for video in videos:
+        feed.add_item(
+            title=video.title,
+            link=video.url,
+            unique_id=video.url,
+            description=format_html(
+                '<img src="{}" alt="{}" />', video.thumbnail_image, video.title
+            ),
+            pubdate=video.published_date,
+            author_name=video.channel.title,
+            author_link=video.channel.url,
+        )
+        # add_item only fills in the defaults, items are not kept
+        yield feed.items.pop()
+
+
+def feed_response(feed, videos):
+    return StreamingHttpResponse(
+        feed.stream(video_items(feed, videos)), content_type=feed.content_type
+    )
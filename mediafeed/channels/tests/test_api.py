@@ -0,0 +1,173 @@
+import datetime
+import json
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from model_bakery import baker
+
+from channels.models import Category, Channel, Video
+
+
+def read_json(response):
+    return json.loads(b"".join(response.streaming_content))
+
+
+class CategoriesApiTestCase(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user("user", "user@test.com", "userpassword")
+        self.public_category = baker.make(
+            Category, title="Public", public=True, user=self.user
+        )
+        self.private_category = baker.make(
+            Category, title="Private", public=False, user=self.user
+        )
+        self.url = reverse("api:categories", args=(self.user.username,))
+
+    def test_public_categories(self):
+        response = self.client.get(self.url)
+
+        self.assertEqual(
+            response.json(),
+            {
+                "categories": [
+                    {
+                        "title": "Public",
+                        "slug": "public",
+                        "public": True,
+                        "videos": "http://testserver/api/user/categories/public/videos/",
+                    }
+                ]
+            },
+        )
+
+    def test_owner_has_private_categories(self):
+        self.client.login(username=self.user.username, password="userpassword")
+
+        response = self.client.get(self.url)
+
+        slugs = [category["slug"] for category in response.json()["categories"]]
+        self.assertEqual(slugs, ["private", "public"])
+
+    def test_user_without_public_categories(self):
+        self.public_category.delete()
+
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 404)
+
+    def test_is_read_only(self):
+        response = self.client.post(self.url)
+
+        self.assertEqual(response.status_code, 405)
+
+
+class CategoryVideosApiTestCase(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user("user", "user@test.com", "userpassword")
+        self.category = baker.make(Category, public=True, user=self.user)
+        self.channel = baker.make(Channel, title="Channel", url="https://channel")
+        self.category.channels.add(self.channel)
+        now = timezone.now().replace(microsecond=0)
+        self.videos = [
+            baker.make(
+                Video,
+                channel=self.channel,
+                published_date=now - datetime.timedelta(days=days),
+            )
+            for days in (0, 3, 6, 9)
+        ]
+        self.url = reverse(
+            "api:category_videos", args=(self.user.username, self.category.slug)
+        )
+
+    def test_videos(self):
+        response = self.client.get(self.url)
+
+        self.assertEqual(response["Content-Type"], "application/json")
+        data = read_json(response)
+        video = self.videos[0]
+        self.assertEqual(
+            data["videos"][0],
+            {
+                "id": video.video_id,
+                "title": video.title,
+                "url": video.url,
+                "thumbnail": video.thumbnail_image,
+                "published_date": video.published_date.isoformat().replace(
+                    "+00:00", "Z"
+                ),
+                "channel": {"title": "Channel", "url": "https://channel"},
+            },
+        )
+        self.assertEqual(
+            [video["id"] for video in data["videos"]],
+            [video.video_id for video in self.videos],
+        )
+        self.assertIsNone(data["next"])
+
+    def test_videos_are_paginated(self):
+        first = read_json(self.client.get(self.url, {"page_size": 3}))
+        last = read_json(self.client.get(first["next"]))
+
+        self.assertEqual(
+            [video["id"] for video in first["videos"]],
+            [video.video_id for video in self.videos[:3]],
+        )
+        self.assertIn("page_size=3", first["next"])
+        self.assertEqual(
+            [video["id"] for video in last["videos"]], [self.videos[3].video_id]
+        )
+        self.assertIsNone(last["next"])
+
+    def test_videos_since(self):
+        since = self.videos[2].published_date.isoformat()
+
+        data = read_json(self.client.get(self.url, {"since": since}))
+
+        self.assertEqual(
+            [video["id"] for video in data["videos"]],
+            [video.video_id for video in self.videos[:2]],
+        )
+
+    def test_videos_of_period(self):
+        data = read_json(self.client.get(self.url, {"period": "week"}))
+
+        self.assertEqual(
+            [video["id"] for video in data["videos"]],
+            [video.video_id for video in self.videos[:3]],
+        )
+
+    def test_selected_fields(self):
+        for fields, queries in (("id,title", 3), ("published_date", 3)):
+            with self.subTest(fields=fields):
+                with self.assertNumQueries(queries):
+                    data = read_json(self.client.get(self.url, {"fields": fields}))
+
+                self.assertEqual(
+                    [list(video) for video in data["videos"]],
+                    [fields.split(",")] * len(self.videos),
+                )
+
+    def test_invalid_parameters(self):
+        for params in (
+            {"fields": "id,secret"},
+            {"period": "month"},
+            {"since": "yesterday"},
+            {"since": "2020-13-01T00:00:00"},
+        ):
+            with self.subTest(params=params):
+                response = self.client.get(self.url, params)
+
+                self.assertEqual(response.status_code, 400)
+                self.assertIn("error", response.json())
+
+    def test_private_category(self):
+        self.category.public = False
+        self.category.save()
+
+        self.assertEqual(self.client.get(self.url).status_code, 404)
+
+        self.client.login(username=self.user.username, password="userpassword")
+        self.assertEqual(self.client.get(self.url).status_code, 200)
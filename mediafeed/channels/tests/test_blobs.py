@@ -0,0 +1,100 @@
+import shutil
+import tempfile
+from io import StringIO
+
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from model_bakery import baker
+
+from channels.blobs import DatabaseBlobStore, FileSystemBlobStore
+from channels.models import Feed, FeedBlob, Video
+
+RAW_ENTRY = "<entry><content>Content collected from YouTube RSS feed</content></entry>"
+
+
+class DatabaseBlobStoreTestCase(TestCase):
+    def setUp(self):
+        self.store = DatabaseBlobStore()
+
+    def test_put_and_get(self):
+        (digest,) = self.store.put_many([RAW_ENTRY])
+
+        self.assertEqual(self.store.get(digest), RAW_ENTRY)
+
+    def test_blobs_are_compressed(self):
+        content = RAW_ENTRY * 10
+        (digest,) = self.store.put_many([content])
+
+        self.assertLess(len(FeedBlob.objects.get(digest=digest).data), len(content) / 4)
+
+    def test_same_content_is_stored_once(self):
+        digests = self.store.put_many([RAW_ENTRY, RAW_ENTRY])
+        self.store.put_many([RAW_ENTRY])
+
+        self.assertEqual(digests[0], digests[1])
+        self.assertEqual(FeedBlob.objects.count(), 1)
+
+
+class FileSystemBlobStoreTestCase(TestCase):
+    def setUp(self):
+        self.location = tempfile.mkdtemp()
+        self.store = FileSystemBlobStore(location=self.location)
+
+    def tearDown(self):
+        shutil.rmtree(self.location)
+
+    def test_put_and_get(self):
+        (digest,) = self.store.put_many([RAW_ENTRY])
+
+        self.assertEqual(self.store.get(digest), RAW_ENTRY)
+        self.assertTrue(self.store.path(digest).startswith(self.location))
+
+
+class FeedContentTestCase(TestCase):
+    def setUp(self):
+        self.video = baker.make(Video)
+
+    def test_inline_content(self):
+        (feed,) = Feed.build_many([(self.video.pk, RAW_ENTRY)])
+        feed.save()
+
+        self.assertEqual(feed.feed, RAW_ENTRY)
+        self.assertEqual(Feed.objects.get().content, RAW_ENTRY)
+
+    @override_settings(FEED_BLOB_STORE={"BACKEND": "channels.blobs.DatabaseBlobStore"})
+    def test_content_in_blob_store(self):
+        (feed,) = Feed.build_many([(self.video.pk, RAW_ENTRY)])
+        feed.save()
+
+        self.assertEqual(feed.feed, "")
+        self.assertTrue(feed.digest)
+        self.assertEqual(Feed.objects.get().content, RAW_ENTRY)
+
+    def test_json_content_of_older_versions(self):
+        Feed.objects.create(video=self.video, feed='{"title": "Title"}')
+
+        self.assertEqual(
+            Feed.objects.get().content,
+            '<entry xmlns="http://www.w3.org/2005/Atom" '
+            'xmlns:yt="http://www.youtube.com/xml/schemas/2015" '
+            'xmlns:media="http://search.yahoo.com/mrss/"><title>Title</title></entry>',
+        )
+
+    def test_content_in_blob_store_without_store_configured(self):
+        Feed.objects.create(video=self.video, digest="0" * 64)
+
+        with self.assertRaises(ImproperlyConfigured):
+            Feed.objects.get().content
+
+    @override_settings(FEED_BLOB_STORE={"BACKEND": "channels.blobs.DatabaseBlobStore"})
+    def test_store_feeds_command(self):
+        Feed.objects.create(video=self.video, feed=RAW_ENTRY)
+        stdout = StringIO()
+
+        call_command("store_feeds", stdout=stdout)
+
+        feed = Feed.objects.get()
+        self.assertEqual(feed.feed, "")
+        self.assertEqual(feed.content, RAW_ENTRY)
+        self.assertIn("Moved 1 feed entries", stdout.getvalue())
@@ -0,0 +1,136 @@
+import datetime
+import json
+from unittest.mock import patch
+from xml.etree import ElementTree
+
+import xmltodict
+from django.test import TestCase
+
+from channels.feeds import (
+    ATOM_NAMESPACE,
+    entry_from_json,
+    parse_datetime,
+    parse_entry,
+    parse_feed,
+)
+from channels.tests.utils import load_fixture
+
+CHANNEL_FEED_CONTENT = load_fixture("feed.xml")
+FIRST_ENTRY = (
+    datetime.datetime(2020, 6, 12, 12, 38, 30, tzinfo=datetime.timezone.utc),
+    "UiFvgk0W3f8",
+)
+SECOND_ENTRY = (
+    datetime.datetime(2020, 6, 5, 22, 0, 11, tzinfo=datetime.timezone.utc),
+    "k2Jm3XQ-d7U",
+)
+
+
+class ParseFeedTestCase(TestCase):
+    def test_parse_all_entries(self):
+        entries = list(parse_feed(CHANNEL_FEED_CONTENT))
+
+        self.assertEqual(
+            [entry.video_id for entry in entries],
+            ["UiFvgk0W3f8", "k2Jm3XQ-d7U", "8bXo1ZpWz4c"],
+        )
+
+    def test_parse_entry_fields(self):
+        entry = next(parse_feed(CHANNEL_FEED_CONTENT))
+
+        self.assertEqual(entry.url, "https://www.youtube.com/watch?v=UiFvgk0W3f8")
+        self.assertEqual(
+            entry.title,
+            "LHC Convida : Gedeane Kenshima [wearables e Eletrônica, como começar?] #FiqueEmCasa",
+        )
+        self.assertEqual(
+            entry.thumbnail_image, "https://i2.ytimg.com/vi/UiFvgk0W3f8/hqdefault.jpg"
+        )
+        self.assertEqual(
+            entry.published_date,
+            datetime.datetime(2020, 6, 12, 12, 38, 30, tzinfo=datetime.timezone.utc),
+        )
+
+    def test_raw_entry_keeps_original_element(self):
+        entry = next(parse_feed(CHANNEL_FEED_CONTENT))
+
+        self.assertEqual(
+            parse_entry(ElementTree.fromstring(entry.raw))._replace(raw=entry.raw),
+            entry,
+        )
+
+    def test_parsing_does_not_register_namespaces(self):
+        next(parse_feed(CHANNEL_FEED_CONTENT))
+
+        element = ElementTree.Element(f"{{{ATOM_NAMESPACE}}}feed")
+        self.assertNotIn("atom:", ElementTree.tostring(element, encoding="unicode"))
+
+    def test_entry_from_json(self):
+        (entry,) = xmltodict.parse(CHANNEL_FEED_CONTENT)["feed"]["entry"][:1]
+
+        raw = entry_from_json(json.dumps(entry))
+
+        self.assertEqual(
+            parse_entry(ElementTree.fromstring(raw))._replace(raw=None),
+            next(parse_feed(CHANNEL_FEED_CONTENT))._replace(raw=None),
+        )
+
+    def test_parse_feed_without_entries(self):
+        content = (
+            b'<feed xmlns="http://www.w3.org/2005/Atom"><title>Empty</title></feed>'
+        )
+
+        self.assertEqual(list(parse_feed(content)), [])
+
+    def test_parsing_stops_at_watermark(self):
+        entries = list(parse_feed(CHANNEL_FEED_CONTENT, watermark=SECOND_ENTRY))
+
+        self.assertEqual([entry.video_id for entry in entries], ["UiFvgk0W3f8"])
+
+    def test_parsing_stops_at_older_entries(self):
+        watermark = (SECOND_ENTRY[0], "another-video")
+
+        entries = list(parse_feed(CHANNEL_FEED_CONTENT, watermark=watermark))
+
+        self.assertEqual(
+            [entry.video_id for entry in entries], ["UiFvgk0W3f8", "k2Jm3XQ-d7U"]
+        )
+
+    @patch("channels.feeds.parse_entry", wraps=parse_entry)
+    def test_entries_after_watermark_are_not_parsed(self, mock_parse_entry):
+        entries = list(parse_feed(CHANNEL_FEED_CONTENT, watermark=FIRST_ENTRY))
+
+        self.assertEqual(entries, [])
+        self.assertEqual(mock_parse_entry.call_count, 1)
+
+
+class ParseDatetimeTestCase(TestCase):
+    def test_parse_rfc3339_timestamp(self):
+        self.assertEqual(
+            parse_datetime("2020-06-12T12:38:30+00:00"),
+            datetime.datetime(2020, 6, 12, 12, 38, 30, tzinfo=datetime.timezone.utc),
+        )
+
+    def test_parse_utc_designator(self):
+        self.assertEqual(
+            parse_datetime("2020-06-12T12:38:30Z"),
+            datetime.datetime(2020, 6, 12, 12, 38, 30, tzinfo=datetime.timezone.utc),
+        )
+
+    def test_naive_timestamp_is_utc(self):
+        self.assertEqual(
+            parse_datetime("2020-06-12T12:38:30"),
+            datetime.datetime(2020, 6, 12, 12, 38, 30, tzinfo=datetime.timezone.utc),
+        )
+
+    @patch("channels.feeds.dateparser.parse")
+    def test_fast_path_does_not_use_dateparser(self, mock_parse):
+        parse_datetime("2020-06-12T12:38:30+00:00")
+
+        mock_parse.assert_not_called()
+
+    def test_fallback_to_dateparser(self):
+        self.assertEqual(
+            parse_datetime("Fri, 12 Jun 2020 12:38:30 +0000"),
+            datetime.datetime(2020, 6, 12, 12, 38, 30, tzinfo=datetime.timezone.utc),
+        )
@@ -0,0 +1,161 @@
+import datetime
+import io
+from unittest.mock import patch
+
+import requests
+from django.test import TestCase, override_settings
+
+from channels.http import HTTPClient, ResponseTooLarge, get_http_client
+
+
+def make_response(status_code=200, content=b"", headers=None):
+    response = requests.Response()
+    response.status_code = status_code
+    response.url = "http://channel.url"
+    response.raw = io.BytesIO(content)
+    response.headers.update(headers or {})
+    return response
+
+
+class HTTPClientTestCase(TestCase):
+    def setUp(self):
+        self.client = HTTPClient(retries=2, max_response_size=10)
+        self.patch_get = patch.object(self.client.session, "get")
+        self.patch_sleep = patch("channels.http.time.sleep")
+
+        self.mock_get = self.patch_get.start()
+        self.mock_sleep = self.patch_sleep.start()
+
+    def tearDown(self):
+        self.patch_get.stop()
+        self.patch_sleep.stop()
+
+    def test_get_reads_response_content(self):
+        self.mock_get.return_value = make_response(content=b"content")
+
+        response = self.client.get("http://channel.url", headers={"A": "B"})
+
+        self.assertEqual(response.content, b"content")
+        self.mock_get.assert_called_with(
+            "http://channel.url",
+            headers={"A": "B"},
+            timeout=self.client.timeout,
+            stream=True,
+        )
+
+    def test_post_sends_data(self):
+        with patch.object(self.client.session, "post") as mock_post:
+            mock_post.return_value = make_response(status_code=202)
+
+            response = self.client.post("http://hub.url", data={"a": "b"})
+
+        self.assertEqual(response.status_code, 202)
+        mock_post.assert_called_with(
+            "http://hub.url",
+            data={"a": "b"},
+            headers=None,
+            timeout=self.client.timeout,
+            stream=True,
+        )
+
+    def test_retry_server_errors(self):
+        self.mock_get.side_effect = [
+            make_response(status_code=503),
+            make_response(status_code=429),
+            make_response(content=b"content"),
+        ]
+
+        response = self.client.get("http://channel.url")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.mock_get.call_count, 3)
+        self.assertEqual(self.mock_sleep.call_count, 2)
+
+    def test_elapsed_time_includes_retries(self):
+        clock = [0.0]
+
+        def sleep(delay):
+            clock[0] += 2
+
+        self.mock_sleep.side_effect = sleep
+        self.mock_get.side_effect = [
+            make_response(status_code=503),
+            make_response(content=b"content"),
+        ]
+
+        with patch("channels.http.time.perf_counter", lambda: clock[0]):
+            response = self.client.get("http://channel.url")
+
+        self.assertEqual(response.elapsed, datetime.timedelta(seconds=2))
+
+    def test_return_last_response_when_retries_are_exhausted(self):
+        self.mock_get.side_effect = [make_response(status_code=500) for _ in range(3)]
+
+        response = self.client.get("http://channel.url")
+
+        self.assertEqual(response.status_code, 500)
+        self.assertEqual(self.mock_get.call_count, 3)
+
+    def test_client_errors_are_not_retried(self):
+        self.mock_get.return_value = make_response(status_code=404)
+
+        response = self.client.get("http://channel.url")
+
+        self.assertEqual(response.status_code, 404)
+        self.mock_get.assert_called_once()
+
+    def test_retry_connection_errors(self):
+        self.mock_get.side_effect = [
+            requests.ConnectionError(),
+            requests.Timeout(),
+            make_response(content=b"content"),
+        ]
+
+        response = self.client.get("http://channel.url")
+
+        self.assertEqual(response.content, b"content")
+
+    def test_raise_connection_error_when_retries_are_exhausted(self):
+        self.mock_get.side_effect = requests.ConnectionError()
+
+        with self.assertRaises(requests.ConnectionError):
+            self.client.get("http://channel.url")
+
+        self.assertEqual(self.mock_get.call_count, 3)
+
+    def test_honor_retry_after(self):
+        self.mock_get.side_effect = [
+            make_response(status_code=429, headers={"Retry-After": "7"}),
+            make_response(),
+        ]
+
+        self.client.get("http://channel.url")
+
+        self.mock_sleep.assert_called_once_with(7)
+
+    def test_backoff_is_bounded(self):
+        for attempt in range(20):
+            self.assertLessEqual(self.client.get_backoff(attempt), 30)
+
+    def test_reject_large_content_length(self):
+        self.mock_get.return_value = make_response(headers={"Content-Length": "11"})
+
+        with self.assertRaises(ResponseTooLarge):
+            self.client.get("http://channel.url")
+
+    def test_reject_large_streamed_body(self):
+        self.mock_get.return_value = make_response(content=b"x" * 11)
+
+        with self.assertRaises(ResponseTooLarge):
+            self.client.get("http://channel.url")
+
+
+class GetHTTPClientTestCase(TestCase):
+    def test_client_is_shared(self):
+        self.assertIs(get_http_client(), get_http_client())
+
+    @override_settings(
+        HTTP_CLIENT={"BACKEND": "channels.http.HTTPClient", "OPTIONS": {"retries": 7}}
+    )
+    def test_client_is_configured_by_settings(self):
+        self.assertEqual(get_http_client().retries, 7)
@@ -0,0 +1,77 @@
+from django.test import TestCase
+from model_bakery import baker
+
+from channels.feeds import parse_feed
+from channels.ingest import ingest_feeds
+from channels.models import Category, Channel, Feed, TimelineEntry, Video
+from channels.tests.utils import load_fixture
+
+CHANNEL_FEED = list(parse_feed(load_fixture("feed.xml")))
+
+
+class IngestFeedsTestCase(TestCase):
+    def test_ingest_stores_videos_and_raw_entries(self):
+        channel = baker.make(Channel)
+
+        new_videos = ingest_feeds([(channel, CHANNEL_FEED)])
+
+        self.assertEqual(new_videos, [3])
+        video = Video.objects.get(video_id="UiFvgk0W3f8")
+        self.assertEqual(video.channel, channel)
+        self.assertEqual(video.url, "https://www.youtube.com/watch?v=UiFvgk0W3f8")
+        self.assertEqual(
+            video.thumbnail_image, "https://i2.ytimg.com/vi/UiFvgk0W3f8/hqdefault.jpg"
+        )
+        self.assertEqual(Feed.objects.count(), 3)
+        self.assertIn("UiFvgk0W3f8", video.feed.feed)
+
+    def test_ingest_many_channels_with_a_fixed_number_of_queries(self):
+        channels = baker.make(Channel, _quantity=5)
+        other_feed = list(
+            parse_feed(load_fixture("feed.xml").replace(b"UiFvgk0W3f8", b"NEW_VIDEO_1"))
+        )
+
+        # Lookup, video insert, pk lookup, feed insert and category lookup,
+        # plus scheduling and saving each channel
+        with self.assertNumQueries(5 + 2 * len(channels) + 2):
+            new_videos = ingest_feeds(
+                [(channels[0], CHANNEL_FEED), (channels[1], other_feed)]
+                + [(channel, None) for channel in channels[2:]]
+            )
+
+        self.assertEqual(new_videos, [3, 1, 0, 0, 0])
+        self.assertEqual(Video.objects.count(), 4)
+
+    def test_ingest_skips_existing_videos(self):
+        channel = baker.make(Channel)
+        ingest_feeds([(channel, CHANNEL_FEED)])
+
+        new_videos = ingest_feeds([(channel, CHANNEL_FEED)])
+
+        self.assertEqual(new_videos, [0])
+        self.assertEqual(Video.objects.count(), 3)
+
+    def test_ingest_ignores_duplicated_entries_between_feeds(self):
+        channel_1, channel_2 = baker.make(Channel, _quantity=2)
+
+        new_videos = ingest_feeds(
+            [(channel_1, CHANNEL_FEED), (channel_2, CHANNEL_FEED)]
+        )
+
+        self.assertEqual(new_videos, [3, 0])
+        self.assertEqual(Video.objects.count(), 3)
+
+    def test_ingest_adds_videos_to_category_timelines(self):
+        channel = baker.make(Channel)
+        categories = baker.make(Category, _quantity=2)
+        for category in categories:
+            category.channels.add(channel)
+
+        ingest_feeds([(channel, CHANNEL_FEED)])
+
+        for category in categories:
+            self.assertEqual(
+                set(category.timeline.values_list("video__video_id", flat=True)),
+                {entry.video_id for entry in CHANNEL_FEED},
+            )
+        self.assertEqual(TimelineEntry.objects.count(), 6)
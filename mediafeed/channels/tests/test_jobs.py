@@ -0,0 +1,153 @@
+import datetime
+from io import StringIO
+from unittest.mock import patch
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from model_bakery import baker
+
+from channels.jobs import run_pending_jobs
+from channels.models import Category, Channel, Job
+from channels.tests.utils import load_fixture
+
+CHANNEL_FEED_CONTENT = load_fixture("feed.xml")
+
+
+class JobQueueTestCase(TestCase):
+    def test_enqueue_job(self):
+        job = Job.objects.enqueue("add_channel", url="http://channel.url")
+
+        self.assertEqual(job.status, Job.PENDING)
+        self.assertEqual(job.data, {"url": "http://channel.url"})
+
+    def test_claim_job(self):
+        job = Job.objects.enqueue("add_channel")
+
+        claimed = Job.objects.claim()
+
+        self.assertEqual(claimed, job)
+        self.assertEqual(claimed.status, Job.RUNNING)
+        self.assertEqual(claimed.attempts, 1)
+        self.assertIsNone(Job.objects.claim())
+
+    def test_do_not_claim_job_scheduled_for_later(self):
+        Job.objects.enqueue("add_channel")
+        Job.objects.update(run_after=timezone.now() + datetime.timedelta(minutes=1))
+
+        self.assertIsNone(Job.objects.claim())
+
+    @override_settings(JOB_TIMEOUT=60)
+    def test_claim_job_of_dead_worker(self):
+        job = Job.objects.enqueue("add_channel")
+        Job.objects.update(
+            status=Job.RUNNING,
+            started_at=timezone.now() - datetime.timedelta(minutes=2),
+        )
+
+        self.assertEqual(Job.objects.claim(), job)
+
+
+@patch("channels.models.get_channel_title", return_value="Channel Title")
+@patch("channels.http.HTTPClient.get")
+class AddChannelJobTestCase(TestCase):
+    def setUp(self):
+        self.category = baker.make(Category)
+
+    def setup_feed(self, mock_get):
+        mock_get.return_value.status_code = 200
+        mock_get.return_value.elapsed = datetime.timedelta(0)
+        mock_get.return_value.headers = {}
+        mock_get.return_value.content = CHANNEL_FEED_CONTENT
+
+    def test_add_channel_job(self, mock_get, mock_title):
+        self.setup_feed(mock_get)
+        job = Job.objects.enqueue(
+            "add_channel",
+            category=self.category,
+            url="https://www.youtube.com/channel/UCsn8UgBuRxGGqKmrAy5d3gA",
+        )
+
+        run_pending_jobs()
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.DONE)
+        self.assertEqual(job.channel.title, "Channel Title")
+        self.assertEqual(job.channel.videos.count(), 3)
+        self.assertTrue(job.channel in self.category.channels.all())
+
+    def test_feed_is_fetched_outside_of_the_transaction(self, mock_get, mock_title):
+        self.setup_feed(mock_get)
+        response = mock_get.return_value
+        savepoints = []
+
+        def get(*args, **kwargs):
+            savepoints.append(len(connection.savepoint_ids))
+            return response
+
+        mock_get.side_effect = get
+        Job.objects.enqueue(
+            "add_channel",
+            category=self.category,
+            url="https://www.youtube.com/channel/UCsn8UgBuRxGGqKmrAy5d3gA",
+        )
+
+        run_pending_jobs()
+
+        self.assertEqual(savepoints, [len(connection.savepoint_ids)])
+        self.assertFalse(Job.objects.exclude(status=Job.DONE).exists())
+
+    @override_settings(JOB_MAX_ATTEMPTS=2)
+    def test_failed_job_is_retried(self, mock_get, mock_title):
+        mock_get.side_effect = ConnectionError("Connection refused")
+        job = Job.objects.enqueue(
+            "add_channel",
+            category=self.category,
+            url="https://www.youtube.com/channel/UCsn8UgBuRxGGqKmrAy5d3gA",
+        )
+
+        with self.assertLogs("channels.jobs", level="ERROR"):
+            run_pending_jobs()
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.PENDING)
+        self.assertIn("Connection refused", job.error)
+
+        mock_get.side_effect = None
+        self.setup_feed(mock_get)
+        Job.objects.update(run_after=timezone.now())
+        run_pending_jobs()
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.DONE)
+        self.assertEqual(Channel.objects.count(), 1)
+
+    @override_settings(JOB_MAX_ATTEMPTS=1)
+    def test_job_fails_after_max_attempts(self, mock_get, mock_title):
+        mock_get.side_effect = ConnectionError("Connection refused")
+        job = Job.objects.enqueue(
+            "add_channel",
+            category=self.category,
+            url="https://www.youtube.com/user/arduinoteam",
+        )
+
+        with self.assertLogs("channels.jobs", level="ERROR"):
+            run_pending_jobs()
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.FAILED)
+
+    def test_run_jobs_command(self, mock_get, mock_title):
+        self.setup_feed(mock_get)
+        Job.objects.enqueue(
+            "add_channel",
+            category=self.category,
+            url="https://www.youtube.com/user/arduinoteam",
+        )
+        stdout = StringIO()
+
+        call_command("run_jobs", "--once", stdout=stdout)
+
+        self.assertIn("Processed 1 jobs", stdout.getvalue())
+        self.assertFalse(Job.objects.exclude(status=Job.DONE).exists())
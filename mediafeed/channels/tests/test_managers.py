@@ -1,12 +1,147 @@
 import datetime
+import os
+import tempfile
+import threading
+from unittest import skipUnless
 
-from django.test import TestCase
+from django.db import connection
+from django.test import TestCase, TransactionTestCase
 from django.utils import timezone
 from model_bakery import baker
 
 from channels.models import Category, Channel, Video
 
 
+class ChannelManagerTestCase(TestCase):
+    def test_due_channels(self):
+        now = timezone.now()
+        never_synced = baker.make(Channel, next_sync_at=None)
+        due = baker.make(Channel, next_sync_at=now - datetime.timedelta(minutes=1))
+        not_due = baker.make(Channel, next_sync_at=now + datetime.timedelta(minutes=1))
+
+        channels = Channel.objects.due(now)
+
+        self.assertTrue(never_synced in channels)
+        self.assertTrue(due in channels)
+        self.assertTrue(not_due not in channels)
+
+    def test_parked_channels_are_not_due(self):
+        parked = baker.make(Channel, next_sync_at=None, parked_at=timezone.now())
+
+        self.assertTrue(parked not in Channel.objects.due())
+
+    def test_claim_leases_due_channels(self):
+        now = timezone.now()
+        due = baker.make(Channel, next_sync_at=None)
+        baker.make(Channel, next_sync_at=now + datetime.timedelta(minutes=1))
+
+        channels = Channel.objects.claim("worker-1", 10, now)
+
+        self.assertEqual(channels, [due])
+        due.refresh_from_db()
+        self.assertEqual(due.lease_owner, "worker-1")
+        self.assertGreater(due.lease_expires_at, now)
+
+    def test_claimed_channels_are_not_claimed_again(self):
+        baker.make(Channel, next_sync_at=None, _quantity=3)
+
+        first = Channel.objects.claim("worker-1", 2)
+        second = Channel.objects.claim("worker-2", 2)
+
+        self.assertEqual(len(first), 2)
+        self.assertEqual(len(second), 1)
+        self.assertFalse(set(first) & set(second))
+        self.assertEqual(Channel.objects.claim("worker-3", 2), [])
+
+    def test_expired_leases_are_reclaimed(self):
+        now = timezone.now()
+        channel = baker.make(
+            Channel,
+            next_sync_at=None,
+            lease_owner="dead-worker",
+            lease_expires_at=now - datetime.timedelta(seconds=1),
+        )
+
+        self.assertEqual(Channel.objects.claim("worker-1", 10, now), [channel])
+
+    def test_release_only_frees_own_leases(self):
+        own, other = baker.make(Channel, next_sync_at=None, _quantity=2)
+        Channel.objects.filter(pk=own.pk).claim("worker-1", 10)
+        Channel.objects.filter(pk=other.pk).claim("worker-2", 10)
+
+        Channel.objects.release("worker-1")
+
+        self.assertEqual(list(Channel.objects.claim("worker-3", 10)), [own])
+
+    def test_claim_all_claims_in_batches(self):
+        baker.make(Channel, next_sync_at=None, _quantity=5)
+        claimed = []
+
+        for channel in Channel.objects.claim_all("worker-1", 2):
+            claimed.append(channel)
+
+        self.assertEqual(len(claimed), 5)
+        self.assertEqual(Channel.objects.filter(lease_owner="worker-1").count(), 5)
+
+    def test_claim_all_renews_leases_of_earlier_batches(self):
+        baker.make(Channel, next_sync_at=None, _quantity=3)
+        channels = Channel.objects.claim_all("worker-1", 2)
+        first = next(channels)
+        next(channels)
+        soon = timezone.now() + datetime.timedelta(seconds=1)
+        Channel.objects.filter(lease_owner="worker-1").update(lease_expires_at=soon)
+
+        next(channels)
+
+        first.refresh_from_db()
+        self.assertGreater(first.lease_expires_at, soon + datetime.timedelta(seconds=1))
+
+
+@skipUnless(connection.vendor == "sqlite", "Only SQLite locks the whole database")
+class ConcurrentClaimTestCase(TransactionTestCase):
+    def setUp(self):
+        baker.make(Channel, next_sync_at=None, _quantity=100)
+        # The in-memory test database has table locks that never wait, so the
+        # workers use a copy of it in a file, locked like a real database
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "db.sqlite3")
+        with connection.cursor() as cursor:
+            cursor.execute("VACUUM INTO %s", [self.path])
+
+    def test_workers_claim_from_their_own_connections(self):
+        claimed = {}
+        errors = []
+        barrier = threading.Barrier(4)
+
+        def work(owner):
+            # Each thread has its own connection, opened on the copy
+            connection.settings_dict = {**connection.settings_dict, "NAME": self.path}
+            barrier.wait()
+            try:
+                claimed[owner] = [
+                    channel.pk for channel in Channel.objects.claim_all(owner, 5)
+                ]
+            except Exception as exc:
+                errors.append(exc)
+            finally:
+                connection.close()
+
+        threads = [
+            threading.Thread(target=work, args=(f"worker-{number}",))
+            for number in range(4)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        pks = [pk for owner_pks in claimed.values() for pk in owner_pks]
+        self.assertEqual(len(pks), 100)
+        self.assertEqual(len(set(pks)), 100)
+
+
 class VideoManagerTestCase(TestCase):
     def setUp(self):
         self.channel = baker.make(Channel)
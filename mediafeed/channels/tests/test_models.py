@@ -1,12 +1,18 @@
 import datetime
 from unittest.mock import patch
 
+import requests
 from django.contrib.auth.models import User
 from django.core.exceptions import ValidationError
-from django.test import TestCase
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from model_bakery import baker
 
 from channels.models import Category, Channel, Feed, Video
+from channels.tests.utils import load_fixture
+
+CHANNEL_FEED_CONTENT = load_fixture("feed.xml")
 
 
 class ChannelTestCase(TestCase):
@@ -65,6 +71,195 @@ class ChannelTestCase(TestCase):
         self.assertTrue(channel in channels)
 
 
+class ChannelSyncVideosTestCase(TestCase):
+    def setUp(self):
+        self.channel = baker.make(Channel)
+        self.patch_get = patch("channels.http.HTTPClient.get")
+
+        self.mock_get = self.patch_get.start()
+        self.mock_get.return_value.status_code = 200
+        self.mock_get.return_value.elapsed = datetime.timedelta(0)
+        self.mock_get.return_value.headers = {
+            "ETag": '"feed-etag"',
+            "Last-Modified": "Fri, 12 Jun 2020 12:38:30 GMT",
+        }
+        self.mock_get.return_value.content = CHANNEL_FEED_CONTENT
+        self.mock_get.return_value.text = CHANNEL_FEED_CONTENT.decode("utf-8")
+
+    def tearDown(self):
+        self.patch_get.stop()
+
+    def test_sync_videos_creates_new_videos(self):
+        new_videos = self.channel.sync_videos()
+
+        self.assertEqual(new_videos, 3)
+        self.assertEqual(self.channel.videos.count(), 3)
+        self.assertEqual(Feed.objects.filter(video__channel=self.channel).count(), 3)
+
+    def test_sync_videos_only_looks_up_videos_of_the_feed(self):
+        baker.make(Video, _quantity=20)
+
+        with CaptureQueriesContext(connection) as queries:
+            self.channel.sync_videos()
+
+        lookups = [
+            query["sql"]
+            for query in queries
+            if query["sql"].startswith('SELECT "channels_video"."video_id"')
+        ]
+        self.assertTrue(lookups)
+        for lookup in lookups:
+            self.assertIn('"channels_video"."video_id" IN (', lookup)
+
+    def test_sync_videos_skips_existing_videos(self):
+        baker.make(Video, video_id="UiFvgk0W3f8")
+
+        new_videos = self.channel.sync_videos()
+
+        self.assertEqual(new_videos, 2)
+        self.assertEqual(Video.objects.filter(video_id="UiFvgk0W3f8").count(), 1)
+
+    def test_sync_videos_stores_http_validators(self):
+        self.channel.sync_videos()
+
+        self.channel.refresh_from_db()
+        self.assertEqual(self.channel.etag, '"feed-etag"')
+        self.assertEqual(self.channel.last_modified, "Fri, 12 Jun 2020 12:38:30 GMT")
+        self.assertTrue(self.channel.feed_hash)
+
+    def test_sync_videos_sends_conditional_headers(self):
+        self.channel.sync_videos()
+        self.channel.sync_videos()
+
+        self.mock_get.assert_called_with(
+            self.channel.feed_url,
+            headers={
+                "If-None-Match": '"feed-etag"',
+                "If-Modified-Since": "Fri, 12 Jun 2020 12:38:30 GMT",
+            },
+        )
+
+    @patch("channels.models.parse_feed")
+    def test_not_modified_feed_is_not_parsed(self, mock_parse):
+        self.channel.etag = '"feed-etag"'
+        self.mock_get.return_value.status_code = 304
+        self.mock_get.return_value.elapsed = datetime.timedelta(0)
+
+        new_videos = self.channel.sync_videos()
+
+        self.assertEqual(new_videos, 0)
+        mock_parse.assert_not_called()
+
+    def test_sync_videos_schedules_next_sync(self):
+        self.channel.sync_videos()
+
+        self.channel.refresh_from_db()
+        self.assertIsNotNone(self.channel.sync_interval)
+        self.assertFalse(Channel.objects.due().filter(pk=self.channel.pk).exists())
+
+    @override_settings(SYNC_MAX_INTERVAL=30 * 24 * 60 * 60)
+    def test_sync_videos_backs_off_when_feed_is_unchanged(self):
+        self.channel.sync_videos()
+        first_interval = self.channel.sync_interval
+
+        self.channel.sync_videos()
+
+        self.assertGreater(self.channel.sync_interval, first_interval)
+
+    def test_identical_feed_is_not_parsed(self):
+        self.channel.sync_videos()
+
+        with patch("channels.models.parse_feed") as mock_parse:
+            new_videos = self.channel.sync_videos()
+
+        self.assertEqual(new_videos, 0)
+        mock_parse.assert_not_called()
+
+    def test_sync_videos_stores_watermark(self):
+        self.channel.sync_videos()
+
+        self.channel.refresh_from_db()
+        self.assertEqual(
+            self.channel.watermark_published_date,
+            datetime.datetime(2020, 6, 12, 12, 38, 30, tzinfo=datetime.timezone.utc),
+        )
+        self.assertEqual(self.channel.watermark_video_id, "UiFvgk0W3f8")
+
+    def test_sync_videos_only_parses_entries_newer_than_watermark(self):
+        self.channel.watermark_published_date = datetime.datetime(
+            2020, 6, 5, 22, 0, 11, tzinfo=datetime.timezone.utc
+        )
+        self.channel.watermark_video_id = "k2Jm3XQ-d7U"
+
+        new_videos = self.channel.sync_videos()
+
+        self.assertEqual(new_videos, 1)
+        self.assertEqual(
+            list(self.channel.videos.values_list("video_id", flat=True)),
+            ["UiFvgk0W3f8"],
+        )
+
+    def test_error_response_raises(self):
+        self.mock_get.return_value.status_code = 404
+        self.mock_get.return_value.raise_for_status.side_effect = requests.HTTPError
+
+        with self.assertRaises(requests.HTTPError):
+            self.channel.sync_videos()
+
+    def test_sync_videos_resets_failure_count(self):
+        self.channel.failure_count = 3
+
+        self.channel.sync_videos()
+
+        self.channel.refresh_from_db()
+        self.assertEqual(self.channel.failure_count, 0)
+
+
+@override_settings(
+    SYNC_MIN_INTERVAL=30 * 60, SYNC_MAX_INTERVAL=24 * 60 * 60, SYNC_MAX_FAILURES=3
+)
+class ChannelFailureTestCase(TestCase):
+    def setUp(self):
+        self.channel = baker.make(Channel)
+
+    def test_record_failure(self):
+        self.channel.record_failure("HTTPError('404 Client Error')")
+
+        self.channel.refresh_from_db()
+        self.assertEqual(self.channel.failure_count, 1)
+        self.assertEqual(self.channel.last_error, "HTTPError('404 Client Error')")
+        self.assertIsNotNone(self.channel.last_error_at)
+        self.assertIsNone(self.channel.parked_at)
+
+    def test_consecutive_failures_back_off(self):
+        self.channel.record_failure("error")
+        first_retry = self.channel.next_sync_at - self.channel.last_error_at
+
+        self.channel.record_failure("error")
+        second_retry = self.channel.next_sync_at - self.channel.last_error_at
+
+        self.assertEqual(first_retry, datetime.timedelta(minutes=30))
+        self.assertEqual(second_retry, datetime.timedelta(hours=1))
+
+    def test_channel_is_parked_after_max_failures(self):
+        for _ in range(3):
+            self.channel.record_failure("error")
+
+        self.assertIsNotNone(self.channel.parked_at)
+        self.assertFalse(Channel.objects.due().filter(pk=self.channel.pk).exists())
+
+    def test_unpark(self):
+        for _ in range(3):
+            self.channel.record_failure("error")
+
+        self.channel.unpark()
+
+        self.channel.refresh_from_db()
+        self.assertEqual(self.channel.failure_count, 0)
+        self.assertIsNone(self.channel.parked_at)
+        self.assertTrue(Channel.objects.due().filter(pk=self.channel.pk).exists())
+
+
 class VideoTestCase(TestCase):
     def setUp(self):
         self.channel = baker.make(Channel)
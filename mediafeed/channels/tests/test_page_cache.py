@@ -0,0 +1,263 @@
+from unittest.mock import patch
+
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.test import RequestFactory, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from model_bakery import baker
+
+from channels.feeds import parse_feed
+from channels.ingest import ingest_feeds
+from channels.models import Category, Channel, Video
+from channels.page_cache import category_key, get_page_key
+from channels.tests.utils import load_fixture
+
+
+@override_settings(TIMELINE_CACHE="default")
+class TimelinePageCacheTestCase(TestCase):
+    def setUp(self):
+        caches["default"].clear()
+        # TestCase never commits, so versions are bumped right away
+        self.patch_on_commit = patch(
+            "channels.page_cache.transaction.on_commit", lambda func: func()
+        )
+        self.patch_on_commit.start()
+
+        self.user = User.objects.create_user("user", "user@test.com", "userpassword")
+        self.category = baker.make(Category, public=True, user=self.user)
+        self.channel = baker.make(Channel)
+        self.category.channels.add(self.channel)
+        self.video = baker.make(
+            Video, channel=self.channel, published_date=timezone.now()
+        )
+        self.category_url = reverse(
+            "channels:category_details", args=(self.user.username, self.category.slug)
+        )
+        self.user_url = reverse("channels:user_details", args=(self.user.username,))
+
+    def tearDown(self):
+        self.patch_on_commit.stop()
+
+    def test_cached_pages_do_not_query_database(self):
+        for url in (self.category_url, self.user_url):
+            with self.subTest(url=url):
+                response = self.client.get(url)
+
+                with self.assertNumQueries(0):
+                    cached_response = self.client.get(url)
+
+                self.assertEqual(cached_response.content, response.content)
+
+    def test_pages_are_cached_by_query_string(self):
+        self.client.get(self.category_url, {"period": "all"})
+
+        with self.assertNumQueries(4):
+            self.client.get(self.category_url, {"period": "week"})
+
+    def test_ingested_videos_invalidate_pages(self):
+        category_url = f"{self.category_url}?period=all"
+        user_url = f"{self.user_url}?period=all"
+        self.client.get(category_url)
+        self.client.get(user_url)
+
+        ingest_feeds([(self.channel, list(parse_feed(load_fixture("feed.xml"))))])
+
+        ingested_video = Video.objects.get(video_id="UiFvgk0W3f8")
+        for url in (category_url, user_url):
+            with self.subTest(url=url):
+                response = self.client.get(url)
+                self.assertIn(ingested_video, response.context["videos"])
+
+    def test_channel_changes_invalidate_pages(self):
+        self.client.get(self.category_url)
+
+        self.category.channels.remove(self.channel)
+
+        response = self.client.get(self.category_url)
+        self.assertEqual(response.context["videos"], [])
+
+    def test_deleted_channel_invalidates_pages(self):
+        self.client.get(self.category_url)
+
+        self.channel.delete()
+
+        response = self.client.get(self.category_url)
+        self.assertEqual(response.context["videos"], [])
+
+    def test_renamed_channel_invalidates_pages(self):
+        self.client.get(self.category_url)
+
+        self.channel.title = "Renamed channel"
+        self.channel.save()
+
+        self.assertContains(self.client.get(self.category_url), "Renamed channel")
+
+    def test_synced_channel_keeps_pages_cached(self):
+        self.client.get(self.category_url)
+
+        self.channel.save(update_fields=self.channel.SYNC_FIELDS)
+
+        with self.assertNumQueries(0):
+            self.client.get(self.category_url)
+
+    def test_category_changes_invalidate_pages(self):
+        self.client.get(self.category_url)
+        self.client.get(self.user_url)
+
+        self.category.public = False
+        self.category.save()
+
+        self.assertEqual(self.client.get(self.category_url).status_code, 404)
+        self.assertEqual(self.client.get(self.user_url).status_code, 404)
+
+    def test_other_categories_stay_cached(self):
+        other_category = baker.make(Category, public=True, user=self.user)
+        other_channel = baker.make(Channel)
+        other_category.channels.add(other_channel)
+        self.client.get(self.category_url)
+
+        baker.make(Video, channel=other_channel)
+
+        with self.assertNumQueries(0):
+            self.client.get(self.category_url)
+
+    def test_pages_are_cached_by_parameters_used(self):
+        self.client.get(self.category_url, {"period": "all"})
+
+        for params in (
+            {"period": "all", "utm_source": "feed"},
+            {"period": "all", "before": "not a cursor"},
+            {"period": "all", "page_size": "60"},
+        ):
+            with self.subTest(params=params):
+                with self.assertNumQueries(0):
+                    self.client.get(self.category_url, params)
+
+    def test_pages_of_relative_periods_expire(self):
+        for period in ("last_24h", "week"):
+            with self.subTest(period=period):
+                with patch("channels.page_cache.get_time_window", return_value=1):
+                    self.client.get(self.category_url, {"period": period})
+                    with self.assertNumQueries(0):
+                        self.client.get(self.category_url, {"period": period})
+
+                with patch("channels.page_cache.get_time_window", return_value=2):
+                    response = self.client.get(self.category_url, {"period": period})
+                self.assertIsNotNone(response.context)
+
+    def test_evicted_version_is_a_miss(self):
+        self.client.get(self.category_url)
+
+        caches["default"].delete(category_key(self.user.username, self.category.slug))
+
+        response = self.client.get(self.category_url)
+        self.assertIsNotNone(response.context)
+
+    def test_entry_without_last_modified_is_a_miss(self):
+        self.client.get(self.category_url, {"period": "all"})
+        page_key = get_page_key(
+            RequestFactory().get(self.category_url, {"period": "all"})
+        )
+        cached = caches["default"].get(page_key)
+        del cached["last_modified"]
+        caches["default"].set(page_key, cached)
+
+        response = self.client.get(self.category_url, {"period": "all"})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIsNotNone(response.context)
+
+    def test_pages_of_authenticated_users_are_not_cached(self):
+        self.client.login(username=self.user.username, password="userpassword")
+        self.client.get(self.category_url)
+
+        response = self.client.get(self.category_url)
+
+        self.assertIsNotNone(response.context)
+
+    def test_public_pages_have_validators(self):
+        for url in (self.category_url, self.user_url):
+            with self.subTest(url=url):
+                response = self.client.get(url)
+
+                self.assertTrue(response.has_header("ETag"))
+                self.assertTrue(response.has_header("Last-Modified"))
+                self.assertIn("public", response["Cache-Control"])
+                self.assertIn("max-age=60", response["Cache-Control"])
+                self.assertIn("Cookie", response["Vary"])
+
+    def test_unchanged_page_is_not_modified(self):
+        for url in (self.category_url, self.user_url):
+            with self.subTest(url=url):
+                response = self.client.get(url)
+
+                with self.assertNumQueries(0):
+                    not_modified = self.client.get(
+                        url, HTTP_IF_NONE_MATCH=response["ETag"]
+                    )
+
+                self.assertEqual(not_modified.status_code, 304)
+                self.assertEqual(not_modified["ETag"], response["ETag"])
+                self.assertEqual(not_modified.content, b"")
+
+    def test_pages_of_relative_periods_are_revalidated(self):
+        with patch("channels.page_cache.get_time_window", return_value=1):
+            response = self.client.get(self.category_url)
+
+        with patch("channels.page_cache.get_time_window", return_value=2):
+            revalidated = self.client.get(
+                self.category_url,
+                HTTP_IF_NONE_MATCH=response["ETag"],
+                HTTP_IF_MODIFIED_SINCE=response["Last-Modified"],
+            )
+
+        self.assertEqual(revalidated.status_code, 200)
+        self.assertNotEqual(revalidated["ETag"], response["ETag"])
+
+    def test_unchanged_page_is_not_modified_since(self):
+        response = self.client.get(self.category_url)
+
+        not_modified = self.client.get(
+            self.category_url, HTTP_IF_MODIFIED_SINCE=response["Last-Modified"]
+        )
+
+        self.assertEqual(not_modified.status_code, 304)
+
+    def test_changed_page_is_sent_again(self):
+        response = self.client.get(self.category_url)
+
+        baker.make(Video, channel=self.channel, published_date=timezone.now())
+
+        changed = self.client.get(
+            self.category_url, HTTP_IF_NONE_MATCH=response["ETag"]
+        )
+        self.assertEqual(changed.status_code, 200)
+        self.assertNotEqual(changed["ETag"], response["ETag"])
+
+    def test_pages_of_authenticated_users_are_private(self):
+        self.client.login(username=self.user.username, password="userpassword")
+
+        response = self.client.get(self.category_url)
+
+        self.assertIn("private", response["Cache-Control"])
+        self.assertFalse(response.has_header("ETag"))
+
+
+class TimelinePageWithoutCacheTestCase(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user("user", "user@test.com", "userpassword")
+        self.category = baker.make(Category, public=True, user=self.user)
+        self.category_url = reverse(
+            "channels:category_details", args=(self.user.username, self.category.slug)
+        )
+
+    def test_unchanged_page_is_not_modified(self):
+        response = self.client.get(self.category_url)
+
+        not_modified = self.client.get(
+            self.category_url, HTTP_IF_NONE_MATCH=response["ETag"]
+        )
+
+        self.assertEqual(not_modified.status_code, 304)
+        self.assertFalse(response.has_header("Last-Modified"))
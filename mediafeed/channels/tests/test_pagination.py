@@ -0,0 +1,106 @@
+import datetime
+
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from model_bakery import baker
+
+from channels.models import Video
+from channels.pagination import (
+    decode_cursor,
+    get_page_size,
+    paginate,
+    paginate_merged,
+)
+
+
+class PaginateVideosTestCase(TestCase):
+    def setUp(self):
+        now = timezone.now()
+        self.videos = [
+            baker.make(Video, published_date=now - datetime.timedelta(hours=hours))
+            for hours in range(5)
+        ]
+
+    def test_first_page(self):
+        page = paginate(Video.objects.all(), page_size=2)
+
+        self.assertEqual(page.items, self.videos[:2])
+        self.assertTrue(page.has_next)
+
+    def test_pages_follow_cursor(self):
+        first = paginate(Video.objects.all(), page_size=2)
+        second = paginate(Video.objects.all(), cursor=first.next_cursor, page_size=2)
+        last = paginate(Video.objects.all(), cursor=second.next_cursor, page_size=2)
+
+        self.assertEqual(second.items, self.videos[2:4])
+        self.assertEqual(last.items, self.videos[4:])
+        self.assertFalse(last.has_next)
+
+    def test_videos_published_at_the_same_time_are_not_skipped(self):
+        published_date = self.videos[0].published_date
+        Video.objects.update(published_date=published_date)
+        seen = []
+        cursor = None
+
+        while True:
+            page = paginate(Video.objects.all(), cursor=cursor, page_size=2)
+            seen.extend(page.items)
+            if not page.has_next:
+                break
+            cursor = page.next_cursor
+
+        self.assertEqual(
+            sorted(video.pk for video in seen),
+            sorted(video.pk for video in self.videos),
+        )
+
+    def test_invalid_cursor_starts_from_first_page(self):
+        page = paginate(Video.objects.all(), cursor="not a cursor", page_size=2)
+
+        self.assertEqual(page.items, self.videos[:2])
+
+    def test_decode_invalid_cursor(self):
+        self.assertIsNone(decode_cursor("bm90IGEgY3Vyc29y"))
+
+    @override_settings(TIMELINE_PAGE_SIZE=60, TIMELINE_MAX_PAGE_SIZE=200)
+    def test_page_size(self):
+        self.assertEqual(get_page_size(None), 60)
+        self.assertEqual(get_page_size("invalid"), 60)
+        self.assertEqual(get_page_size("10"), 10)
+        self.assertEqual(get_page_size("0"), 1)
+        self.assertEqual(get_page_size("1000"), 200)
+
+
+class PaginateMergedTestCase(TestCase):
+    def setUp(self):
+        now = timezone.now()
+        self.videos = [
+            baker.make(Video, published_date=now - datetime.timedelta(hours=hours))
+            for hours in range(5)
+        ]
+        self.querysets = [
+            Video.objects.filter(pk__in=[video.pk for video in self.videos[:3]]),
+            Video.objects.filter(pk__in=[video.pk for video in self.videos[1:]]),
+        ]
+
+    def test_items_are_merged_in_order_without_duplicates(self):
+        page = paginate_merged(self.querysets, page_size=10)
+
+        self.assertEqual(page.items, self.videos)
+        self.assertFalse(page.has_next)
+
+    def test_pages_follow_cursor(self):
+        first = paginate_merged(self.querysets, page_size=2)
+        second = paginate_merged(self.querysets, cursor=first.next_cursor, page_size=2)
+        last = paginate_merged(self.querysets, cursor=second.next_cursor, page_size=2)
+
+        self.assertEqual(first.items, self.videos[:2])
+        self.assertEqual(second.items, self.videos[2:4])
+        self.assertEqual(last.items, self.videos[4:])
+        self.assertFalse(last.has_next)
+
+    def test_no_querysets(self):
+        page = paginate_merged([])
+
+        self.assertEqual(page.items, [])
+        self.assertFalse(page.has_next)
@@ -0,0 +1,51 @@
+from django.db import connection
+from django.test import TestCase
+from model_bakery import baker
+
+from channels.models import Category, Channel, TimelineEntry, Video
+
+
+class QueryPlanTestCase(TestCase):
+    def setUp(self):
+        if connection.vendor == "postgresql":
+            # Tables this small are always scanned, which tells nothing
+            # about the plan once they grow
+            with connection.cursor() as cursor:
+                cursor.execute("SET LOCAL enable_seqscan = off")
+
+        self.category = baker.make(Category)
+        channels = baker.make(Channel, _quantity=3)
+        self.category.channels.set(channels)
+        for channel in channels:
+            baker.make(Video, channel=channel, _quantity=5)
+
+    def assertUsesIndex(self, queryset, index):
+        plan = queryset.explain()
+        self.assertIn(index, plan)
+
+    def test_category_timeline_uses_channel_published_index(self):
+        for videos in (
+            Video.objects.for_categories([self.category]).last_24h(),
+            Video.objects.for_categories([self.category]).last_week(),
+        ):
+            with self.subTest(query=str(videos.query)):
+                self.assertUsesIndex(
+                    videos.order_by("-published_date"), "video_channel_published_idx"
+                )
+
+    def test_category_timeline_uses_timeline_index(self):
+        entries = TimelineEntry.objects.filter(category=self.category)
+
+        for entries in (entries.all(), entries.last_24h(), entries.last_week()):
+            with self.subTest(query=str(entries.query)):
+                self.assertUsesIndex(
+                    entries.for_timeline().order_by("-published_date", "video_id"),
+                    "timeline_category_date_idx",
+                )
+
+    def test_category_lookup_uses_user_slug_index(self):
+        categories = Category.objects.filter(
+            user=self.category.user, slug=self.category.slug
+        )
+
+        self.assertUsesIndex(categories, "category_user_slug_idx")
@@ -0,0 +1,250 @@
+import datetime
+import os
+import tempfile
+from io import StringIO
+from unittest.mock import patch
+
+from django.core.exceptions import ValidationError
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+from model_bakery import baker
+
+from channels.feeds import parse_feed
+from channels.managers import ChannelQuerySet
+from channels.models import Channel, SyncRun, Video
+from channels.sync import sync_channels
+from channels.tests.utils import load_fixture
+
+CHANNEL_FEED_CONTENT = load_fixture("feed.xml")
+
+
+class SyncChannelsTestCase(TestCase):
+    def setUp(self):
+        self.patch_get = patch("channels.http.HTTPClient.get")
+
+        self.mock_get = self.patch_get.start()
+        self.mock_get.return_value.status_code = 200
+        self.mock_get.return_value.elapsed = datetime.timedelta(0)
+        self.mock_get.return_value.headers = {}
+        self.mock_get.return_value.content = CHANNEL_FEED_CONTENT
+        self.mock_get.return_value.text = CHANNEL_FEED_CONTENT.decode("utf-8")
+
+    def tearDown(self):
+        self.patch_get.stop()
+
+    def test_sync_creates_videos_of_feed(self):
+        channel = baker.make(Channel)
+
+        summary = sync_channels([channel])
+
+        self.assertEqual(summary.channels, 1)
+        self.assertEqual(summary.new_videos, 3)
+        self.assertEqual(channel.videos.count(), 3)
+
+    def test_sync_with_multiple_workers(self):
+        channels = baker.make(Channel, _quantity=5)
+
+        summary = sync_channels(channels, workers=3)
+
+        self.assertEqual(summary.channels, 5)
+        self.assertEqual(self.mock_get.call_count, 5)
+        self.assertEqual(Video.objects.count(), 3)
+        self.assertEqual(summary.new_videos, 3)
+        self.assertEqual(summary.failures, [])
+
+    def test_unchanged_feeds_are_counted(self):
+        channel = baker.make(Channel)
+        sync_channels([channel])
+
+        summary = sync_channels([channel])
+
+        self.assertEqual(summary.unchanged, 1)
+        self.assertEqual(summary.new_videos, 0)
+
+    def test_failure_does_not_abort_run(self):
+        broken_channel, channel = baker.make(Channel, _quantity=2)
+        response = self.mock_get.return_value
+
+        def get(url, **kwargs):
+            if url == broken_channel.feed_url:
+                raise ConnectionError("Connection refused")
+            return response
+
+        self.mock_get.side_effect = get
+
+        with self.assertLogs("channels.sync", level="ERROR"):
+            summary = sync_channels([broken_channel, channel], workers=2)
+
+        self.assertEqual(summary.channels, 2)
+        self.assertEqual(len(summary.failures), 1)
+        self.assertEqual(summary.failures[0][0], broken_channel)
+        self.assertEqual(channel.videos.count(), 3)
+
+    def test_bad_feed_does_not_fail_the_whole_batch(self):
+        broken_channel, channel = baker.make(Channel, _quantity=2)
+        entry = next(parse_feed(CHANNEL_FEED_CONTENT))
+        # Malformed values fail when the videos are inserted
+        broken_entries = [entry._replace(video_id="broken", published_date="?")]
+        broken_channel.fetch_feed = lambda stats=None: broken_entries
+
+        with self.assertLogs("channels.sync", level="ERROR"):
+            summary = sync_channels([broken_channel, channel], batch_size=2)
+
+        self.assertEqual([channel for channel, _ in summary.failures], [broken_channel])
+        self.assertIsInstance(summary.failures[0][1], ValidationError)
+        self.assertEqual(channel.videos.count(), 3)
+        self.assertEqual(summary.new_videos, 3)
+
+    def test_sync_records_result_of_each_channel(self):
+        channel = baker.make(Channel)
+        broken_channel = baker.make(Channel)
+        response = self.mock_get.return_value
+
+        def get(url, **kwargs):
+            if url == broken_channel.feed_url:
+                raise ConnectionError("Connection refused")
+            return response
+
+        self.mock_get.side_effect = get
+
+        with self.assertLogs("channels.sync", level="ERROR"):
+            summary = sync_channels([channel, broken_channel])
+
+        results = {result.channel: result for result in summary.results}
+        self.assertEqual(results[channel].status_code, 200)
+        self.assertEqual(results[channel].response_size, len(CHANNEL_FEED_CONTENT))
+        self.assertEqual(results[channel].entries, 3)
+        self.assertEqual(results[channel].new_videos, 3)
+        self.assertEqual(results[channel].skipped, 0)
+        self.assertEqual(results[channel].error, "")
+        self.assertIn("Connection refused", results[broken_channel].error)
+
+    def test_failures_are_recorded_on_channel(self):
+        channel = baker.make(Channel)
+        self.mock_get.side_effect = ConnectionError("Connection refused")
+
+        with self.assertLogs("channels.sync", level="ERROR"):
+            sync_channels([channel])
+
+        channel.refresh_from_db()
+        self.assertEqual(channel.failure_count, 1)
+        self.assertIn("Connection refused", channel.last_error)
+        self.assertFalse(Channel.objects.due().filter(pk=channel.pk).exists())
+
+    def test_sync_profiles_worker_threads(self):
+        channel = baker.make(Channel)
+
+        summary = sync_channels([channel], profile=True)
+
+        self.assertEqual(len(summary.profiles), 1)
+
+
+class SyncChannelsCommandTestCase(TestCase):
+    @patch("channels.http.HTTPClient.get")
+    def test_command_prints_summary(self, mock_get):
+        mock_get.return_value.status_code = 200
+        mock_get.return_value.elapsed = datetime.timedelta(0)
+        mock_get.return_value.headers = {}
+        mock_get.return_value.content = CHANNEL_FEED_CONTENT
+        mock_get.return_value.text = CHANNEL_FEED_CONTENT.decode("utf-8")
+        baker.make(Channel, _quantity=2)
+        stdout = StringIO()
+
+        call_command("sync_channels", "--workers=2", "--batch-size=2", stdout=stdout)
+
+        self.assertIn("Synced 2 channels", stdout.getvalue())
+        self.assertIn("3 new videos, 0 unchanged, 0 failures", stdout.getvalue())
+
+    @patch("channels.http.HTTPClient.get")
+    def test_command_syncs_only_due_channels(self, mock_get):
+        mock_get.return_value.status_code = 304
+        mock_get.return_value.elapsed = datetime.timedelta(0)
+        baker.make(Channel, next_sync_at=timezone.now() + datetime.timedelta(hours=1))
+        due_channel = baker.make(Channel, next_sync_at=None)
+        stdout = StringIO()
+
+        call_command("sync_channels", stdout=stdout)
+
+        mock_get.assert_called_once()
+        self.assertEqual(mock_get.call_args[0][0], due_channel.feed_url)
+
+    @patch("channels.http.HTTPClient.get")
+    def test_command_syncs_all_channels(self, mock_get):
+        mock_get.return_value.status_code = 304
+        mock_get.return_value.elapsed = datetime.timedelta(0)
+        baker.make(Channel, next_sync_at=timezone.now() + datetime.timedelta(hours=1))
+        baker.make(Channel, next_sync_at=None)
+        stdout = StringIO()
+
+        call_command("sync_channels", "--all", stdout=stdout)
+
+        self.assertEqual(mock_get.call_count, 2)
+
+    @patch("channels.http.HTTPClient.get")
+    def test_command_skips_channels_leased_by_other_workers(self, mock_get):
+        mock_get.return_value.status_code = 304
+        mock_get.return_value.elapsed = datetime.timedelta(0)
+        baker.make(
+            Channel,
+            next_sync_at=None,
+            lease_owner="other-worker",
+            lease_expires_at=timezone.now() + datetime.timedelta(minutes=5),
+        )
+        channel = baker.make(Channel, next_sync_at=None)
+
+        call_command("sync_channels", stdout=StringIO())
+
+        mock_get.assert_called_once()
+        self.assertEqual(mock_get.call_args[0][0], channel.feed_url)
+        channel.refresh_from_db()
+        self.assertEqual(channel.lease_owner, "")
+        self.assertIsNone(channel.lease_expires_at)
+
+    @patch("channels.http.HTTPClient.get")
+    def test_command_claims_what_workers_can_fetch(self, mock_get):
+        mock_get.return_value.status_code = 304
+        mock_get.return_value.elapsed = datetime.timedelta(0)
+        baker.make(Channel, next_sync_at=None, _quantity=5)
+
+        with patch.object(
+            ChannelQuerySet, "claim", autospec=True, side_effect=ChannelQuerySet.claim
+        ) as mock_claim:
+            call_command(
+                "sync_channels", "--workers=2", "--batch-size=50", stdout=StringIO()
+            )
+
+        self.assertEqual(mock_get.call_count, 5)
+        self.assertEqual(
+            [call.args[2] for call in mock_claim.call_args_list], [4, 4, 4]
+        )
+
+    @patch("channels.http.HTTPClient.get")
+    def test_command_records_sync_run(self, mock_get):
+        mock_get.return_value.status_code = 304
+        mock_get.return_value.elapsed = datetime.timedelta(0)
+        channel = baker.make(Channel)
+        old_run = baker.make(
+            SyncRun, started_at=timezone.now() - datetime.timedelta(days=30)
+        )
+
+        call_command("sync_channels", stdout=StringIO())
+
+        run = SyncRun.objects.get()
+        self.assertNotEqual(run, old_run)
+        self.assertEqual(run.channels, 1)
+        self.assertEqual(run.unchanged, 1)
+        result = run.results.get()
+        self.assertEqual(result.channel, channel)
+        self.assertEqual(result.status_code, 304)
+
+    @patch("channels.http.HTTPClient.get")
+    def test_command_writes_profile(self, mock_get):
+        mock_get.return_value.status_code = 304
+        mock_get.return_value.elapsed = datetime.timedelta(0)
+        baker.make(Channel)
+        path = os.path.join(tempfile.mkdtemp(), "sync.prof")
+
+        call_command("sync_channels", f"--profile={path}", stdout=StringIO())
+
+        self.assertTrue(os.path.getsize(path))
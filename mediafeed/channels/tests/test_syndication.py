@@ -0,0 +1,241 @@
+import datetime
+from unittest.mock import patch
+
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from model_bakery import baker
+from parsel import Selector
+
+from channels.models import Category, Channel, Video
+from channels.syndication import AtomFeed
+
+
+def read_feed(response):
+    return Selector(text=response.getvalue().decode(), type="xml")
+
+
+class StreamingFeedTestCase(TestCase):
+    def test_feed_is_written_item_by_item(self):
+        feed = AtomFeed(title="Feed", link="https://feed", description="")
+        for number in range(3):
+            feed.add_item(
+                title=f"Item {number}",
+                link="https://item",
+                description="",
+                pubdate=timezone.now(),
+            )
+        items, feed.items = feed.items, []
+
+        chunks = list(feed.stream(items))
+
+        # Header, one chunk per item, then the closing tag
+        self.assertEqual(len(chunks), 5)
+        self.assertIn(b"<title>Item 1</title>", chunks[2])
+        self.assertEqual(chunks[-1], b"</feed>")
+
+    def test_feed_without_items(self):
+        feed = AtomFeed(title="Feed", link="https://feed", description="")
+
+        content = b"".join(feed.stream([]))
+
+        self.assertIn(b"<updated>", content)
+        self.assertTrue(content.endswith(b"</feed>"))
+
+
+@override_settings(TIMELINE_CACHE="default", SYNDICATION_FEED_SIZE=3)
+class CategoryFeedTestCase(TestCase):
+    def setUp(self):
+        caches["default"].clear()
+        self.patch_on_commit = patch(
+            "channels.page_cache.transaction.on_commit", lambda func: func()
+        )
+        self.patch_on_commit.start()
+
+        self.user = User.objects.create_user("user", "user@test.com", "userpassword")
+        self.category = baker.make(Category, title="News", public=True, user=self.user)
+        self.channel = baker.make(Channel, title="Channel")
+        self.category.channels.add(self.channel)
+        now = timezone.now()
+        self.videos = [
+            baker.make(
+                Video,
+                channel=self.channel,
+                published_date=now - datetime.timedelta(hours=hours),
+            )
+            for hours in range(5)
+        ]
+        self.atom_url = reverse(
+            "channels:category_feed", args=(self.user.username, "news", "atom")
+        )
+
+    def tearDown(self):
+        self.patch_on_commit.stop()
+
+    def test_atom_feed(self):
+        response = self.client.get(self.atom_url)
+
+        self.assertEqual(
+            response["Content-Type"], "application/atom+xml; charset=utf-8"
+        )
+        feed = read_feed(response)
+        feed.register_namespace("atom", "http://www.w3.org/2005/Atom")
+        self.assertEqual(
+            feed.xpath("/atom:feed/atom:title/text()").get(), "News (user)"
+        )
+        self.assertEqual(
+            feed.xpath("//atom:entry/atom:link/@href").getall(),
+            [video.url for video in self.videos[:3]],
+        )
+        self.assertEqual(
+            feed.xpath("//atom:entry/atom:author/atom:name/text()").getall(),
+            ["Channel"] * 3,
+        )
+
+    def test_rss_feed(self):
+        url = reverse(
+            "channels:category_feed", args=(self.user.username, "news", "rss")
+        )
+
+        feed = read_feed(self.client.get(url))
+
+        self.assertEqual(
+            feed.xpath("//item/link/text()").getall(),
+            [video.url for video in self.videos[:3]],
+        )
+
+    def test_feed_lists_newest_videos_first(self):
+        category = baker.make(Category, title="Old", public=True, user=self.user)
+        channel = baker.make(Channel, title="Old channel")
+        category.channels.add(channel)
+        now = timezone.now()
+        videos = [
+            baker.make(
+                Video,
+                channel=channel,
+                published_date=now - datetime.timedelta(hours=hours),
+            )
+            for hours in range(5, 0, -1)
+        ]
+        url = reverse(
+            "channels:category_feed", args=(self.user.username, "old", "atom")
+        )
+
+        with CaptureQueriesContext(connection) as queries:
+            feed = read_feed(self.client.get(url))
+        feed.register_namespace("atom", "http://www.w3.org/2005/Atom")
+
+        # Without an ORDER BY, the rows depend on the index the planner picks
+        (entries_query,) = [
+            query["sql"]
+            for query in queries
+            if "channels_timelineentry" in query["sql"].split("FROM")[1]
+        ]
+        self.assertIn("ORDER BY", entries_query)
+        self.assertEqual(
+            feed.xpath("//atom:entry/atom:link/@href").getall(),
+            [video.url for video in videos[:-4:-1]],
+        )
+        self.assertEqual(
+            feed.xpath("/atom:feed/atom:updated/text()").get(),
+            videos[-1].published_date.isoformat(),
+        )
+
+    def test_unknown_format(self):
+        url = reverse(
+            "channels:category_feed", args=(self.user.username, "news", "json")
+        )
+
+        self.assertEqual(self.client.get(url).status_code, 404)
+
+    def test_private_category_has_no_feed(self):
+        self.category.public = False
+        self.category.save()
+
+        self.client.login(username=self.user.username, password="userpassword")
+        self.assertEqual(self.client.get(self.atom_url).status_code, 404)
+
+    def test_feed_is_cached_until_next_video(self):
+        content = b"".join(self.client.get(self.atom_url).streaming_content)
+
+        with self.assertNumQueries(0):
+            cached = self.client.get(self.atom_url)
+        self.assertEqual(cached.content, content)
+
+        video = baker.make(Video, channel=self.channel, published_date=timezone.now())
+
+        feed = read_feed(self.client.get(self.atom_url))
+        feed.register_namespace("atom", "http://www.w3.org/2005/Atom")
+        self.assertEqual(feed.xpath("//atom:entry/atom:link/@href").get(), video.url)
+
+    def test_conditional_get(self):
+        response = self.client.get(self.atom_url)
+        b"".join(response.streaming_content)
+
+        not_modified = self.client.get(
+            self.atom_url, HTTP_IF_NONE_MATCH=response["ETag"]
+        )
+
+        self.assertEqual(not_modified.status_code, 304)
+        self.assertIn("public", response["Cache-Control"])
+
+
+@override_settings(SYNDICATION_FEED_SIZE=10)
+class UserFeedTestCase(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user("user", "user@test.com", "userpassword")
+        self.url = reverse("channels:user_feed", args=(self.user.username, "atom"))
+
+    def test_videos_of_public_categories(self):
+        channel = baker.make(Channel)
+        for category in baker.make(Category, user=self.user, public=True, _quantity=2):
+            category.channels.add(channel)
+        public_video = baker.make(Video, channel=channel)
+        private_category = baker.make(Category, user=self.user, public=False)
+        private_channel = baker.make(Channel)
+        private_category.channels.add(private_channel)
+        baker.make(Video, channel=private_channel)
+
+        feed = read_feed(self.client.get(self.url))
+        feed.register_namespace("atom", "http://www.w3.org/2005/Atom")
+
+        self.assertEqual(
+            feed.xpath("//atom:entry/atom:link/@href").getall(), [public_video.url]
+        )
+
+    def test_conditional_get_without_shared_cache(self):
+        category = baker.make(Category, user=self.user, public=True)
+        channel = baker.make(Channel)
+        category.channels.add(channel)
+        baker.make(Video, channel=channel)
+
+        response = self.client.get(self.url)
+        not_modified = self.client.get(self.url, HTTP_IF_NONE_MATCH=response["ETag"])
+        baker.make(Video, channel=channel)
+        modified = self.client.get(self.url, HTTP_IF_NONE_MATCH=response["ETag"])
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(not_modified.status_code, 304)
+        self.assertEqual(modified.status_code, 200)
+
+    def test_user_without_public_categories(self):
+        baker.make(Category, user=self.user, public=False)
+
+        self.assertEqual(self.client.get(self.url).status_code, 404)
+
+    def test_user_page_links_feeds_of_public_categories(self):
+        self.client.login(username=self.user.username, password="userpassword")
+        category = baker.make(Category, user=self.user, public=False)
+        user_url = reverse("channels:user_details", args=(self.user.username,))
+
+        private_page = self.client.get(user_url)
+        category.public = True
+        category.save()
+        public_page = self.client.get(user_url)
+
+        self.assertNotContains(private_page, self.url)
+        self.assertContains(public_page, self.url)
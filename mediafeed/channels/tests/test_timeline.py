@@ -0,0 +1,97 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+from model_bakery import baker
+
+from channels.models import Category, Channel, TimelineEntry, Video
+
+
+class TimelineEntryTestCase(TestCase):
+    def setUp(self):
+        self.category = baker.make(Category)
+        self.channel = baker.make(Channel)
+        self.videos = baker.make(Video, channel=self.channel, _quantity=2)
+
+    def timeline(self, category=None):
+        category = category or self.category
+        return set(category.timeline.values_list("video_id", flat=True))
+
+    def test_adding_channel_adds_its_videos(self):
+        self.category.channels.add(self.channel)
+
+        self.assertEqual(self.timeline(), {video.pk for video in self.videos})
+
+    def test_adding_category_to_channel_adds_its_videos(self):
+        self.channel.category.add(self.category)
+
+        self.assertEqual(self.timeline(), {video.pk for video in self.videos})
+
+    def test_new_video_is_added_to_timelines(self):
+        self.category.channels.add(self.channel)
+
+        video = baker.make(Video, channel=self.channel)
+
+        self.assertIn(video.pk, self.timeline())
+
+    def test_published_date_follows_video(self):
+        self.category.channels.add(self.channel)
+        video = self.videos[0]
+        video.published_date = video.published_date.replace(year=2000)
+
+        video.save()
+
+        entry = TimelineEntry.objects.get(category=self.category, video=video)
+        self.assertEqual(entry.published_date, video.published_date)
+
+    def test_removing_channel_removes_its_videos(self):
+        other_channel = baker.make(Channel)
+        other_video = baker.make(Video, channel=other_channel)
+        self.category.channels.add(self.channel, other_channel)
+
+        self.category.channels.remove(self.channel)
+
+        self.assertEqual(self.timeline(), {other_video.pk})
+
+    def test_clearing_channels_empties_timeline(self):
+        self.category.channels.add(self.channel)
+
+        self.category.channels.clear()
+
+        self.assertEqual(self.timeline(), set())
+
+    def test_clearing_categories_of_channel(self):
+        other_category = baker.make(Category)
+        self.channel.category.add(self.category, other_category)
+
+        self.channel.category.clear()
+
+        self.assertEqual(self.timeline(), set())
+        self.assertEqual(self.timeline(other_category), set())
+
+    def test_deleting_video_removes_it(self):
+        self.category.channels.add(self.channel)
+
+        self.videos[0].delete()
+
+        self.assertEqual(self.timeline(), {self.videos[1].pk})
+
+
+class RebuildTimelinesCommandTestCase(TestCase):
+    def test_rebuild_timelines(self):
+        category = baker.make(Category)
+        channel = baker.make(Channel)
+        category.channels.add(channel)
+        videos = baker.make(Video, channel=channel, _quantity=3)
+        TimelineEntry.objects.all().delete()
+        stale_video = baker.make(Video)
+        baker.make(TimelineEntry, category=category, video=stale_video)
+        stdout = StringIO()
+
+        call_command("rebuild_timelines", stdout=stdout)
+
+        self.assertEqual(
+            set(category.timeline.values_list("video_id", flat=True)),
+            {video.pk for video in videos},
+        )
+        self.assertIn("Rebuilt timelines with 3 entries", stdout.getvalue())
@@ -1,9 +1,17 @@
+import datetime
 from unittest.mock import Mock, patch
 
 from django.conf import settings
-from django.test import TestCase
+from django.core.cache import caches
+from django.test import TestCase, override_settings
 
-from channels.utils import get_channel_feed_url, get_channel_title
+from channels.utils import (
+    get_channel_feed_url,
+    get_channel_title,
+    get_failure_backoff,
+    get_sync_interval,
+    normalize_channel_url,
+)
 
 YOUTUBE_CHANNEL_CONTENT = b"""<html>
     <head>
@@ -16,11 +24,13 @@ YOUTUBE_CHANNEL_CONTENT = b"""<html>
 class ChannelGetTitleTestCase(TestCase):
     def setUp(self):
         self.channel_url = "http://channel.url"
-        self.patch_get = patch("channels.utils.requests.get")
+        self.patch_get = patch("channels.http.HTTPClient.get")
 
         self.mock_get = self.patch_get.start()
         self.mock_get.return_value.status_code = 200
 
+        caches[settings.CHANNEL_METADATA_CACHE].clear()
+
     def tearDown(self):
         self.patch_get.stop()
 
@@ -47,6 +57,45 @@ class ChannelGetTitleTestCase(TestCase):
 
         self.assertTrue(channel_title is None)
 
+    def test_channel_title_is_cached(self):
+        self.mock_get.return_value.content = YOUTUBE_CHANNEL_CONTENT
+
+        get_channel_title(url="https://www.youtube.com/user/arduinoteam")
+        channel_title = get_channel_title(url="https://youtube.com/user/arduinoteam/")
+
+        self.assertEqual(channel_title, "Channel Title")
+        self.mock_get.assert_called_once()
+
+    def test_missing_channel_title_is_cached(self):
+        self.mock_get.return_value.status_code = 404
+
+        get_channel_title(url=self.channel_url)
+        channel_title = get_channel_title(url=self.channel_url)
+
+        self.assertTrue(channel_title is None)
+        self.mock_get.assert_called_once()
+
+    @override_settings(CHANNEL_METADATA_NEGATIVE_TIMEOUT=0)
+    def test_missing_channel_title_expires(self):
+        self.mock_get.return_value.status_code = 404
+
+        get_channel_title(url=self.channel_url)
+        get_channel_title(url=self.channel_url)
+
+        self.assertEqual(self.mock_get.call_count, 2)
+
+
+class NormalizeChannelURLTestCase(TestCase):
+    def test_normalize_channel_url(self):
+        for url in [
+            "https://www.youtube.com/user/arduinoteam",
+            "http://youtube.com/user/arduinoteam/",
+            " https://m.youtube.com/user/arduinoteam?feature=share ",
+        ]:
+            self.assertEqual(
+                normalize_channel_url(url), "https://www.youtube.com/user/arduinoteam"
+            )
+
 
 class ChannelGetFeedURLTestCase(TestCase):
     def setUp(self):
@@ -70,3 +119,66 @@ class ChannelGetFeedURLTestCase(TestCase):
         self.assertEqual(
             f"{settings.BASE_YOUTUBE_FEED_URL}?user=arduinoteam", feed_url,
         )
+
+
+@override_settings(
+    SYNC_MIN_INTERVAL=30 * 60, SYNC_MAX_INTERVAL=24 * 60 * 60, SYNC_BACKOFF_FACTOR=2
+)
+class GetSyncIntervalTestCase(TestCase):
+    def setUp(self):
+        self.now = datetime.datetime(2020, 6, 12, 12, tzinfo=datetime.timezone.utc)
+
+    def published_every(self, gap, count=5):
+        return [self.now - gap * i for i in range(count)]
+
+    def test_interval_is_half_of_median_gap_between_uploads(self):
+        published_dates = self.published_every(datetime.timedelta(hours=8))
+
+        interval = get_sync_interval(published_dates)
+
+        self.assertEqual(interval, datetime.timedelta(hours=4))
+
+    def test_interval_is_bounded_by_min_interval(self):
+        published_dates = self.published_every(datetime.timedelta(minutes=10))
+
+        interval = get_sync_interval(published_dates)
+
+        self.assertEqual(interval, datetime.timedelta(minutes=30))
+
+    def test_interval_is_bounded_by_max_interval(self):
+        published_dates = self.published_every(datetime.timedelta(days=60))
+
+        interval = get_sync_interval(published_dates)
+
+        self.assertEqual(interval, datetime.timedelta(days=1))
+
+    def test_min_interval_for_channel_without_history(self):
+        interval = get_sync_interval([])
+
+        self.assertEqual(interval, datetime.timedelta(minutes=30))
+
+    def test_backoff_when_no_new_videos(self):
+        interval = get_sync_interval(
+            [], previous_interval=datetime.timedelta(hours=2), new_videos=False
+        )
+
+        self.assertEqual(interval, datetime.timedelta(hours=4))
+
+    def test_backoff_is_bounded_by_max_interval(self):
+        interval = get_sync_interval(
+            [], previous_interval=datetime.timedelta(hours=20), new_videos=False
+        )
+
+        self.assertEqual(interval, datetime.timedelta(days=1))
+
+
+@override_settings(SYNC_MIN_INTERVAL=30 * 60, SYNC_MAX_INTERVAL=24 * 60 * 60)
+class GetFailureBackoffTestCase(TestCase):
+    def test_backoff_doubles_on_each_failure(self):
+        self.assertEqual(get_failure_backoff(1), datetime.timedelta(minutes=30))
+        self.assertEqual(get_failure_backoff(2), datetime.timedelta(hours=1))
+        self.assertEqual(get_failure_backoff(4), datetime.timedelta(hours=4))
+
+    def test_backoff_is_bounded_by_max_interval(self):
+        self.assertEqual(get_failure_backoff(20), datetime.timedelta(days=1))
+        self.assertEqual(get_failure_backoff(10 ** 6), datetime.timedelta(days=1))
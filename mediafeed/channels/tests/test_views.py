@@ -7,7 +7,8 @@ from django.utils import timezone
 from model_bakery import baker
 from parsel import Selector
 
-from channels.models import Category, Channel, Video
+from channels.models import Category, Channel, Job, Video
+from channels.tests.utils import QueryBudgetMixin
 
 
 class CategoryDetailAccessTestCase(TestCase):
@@ -253,6 +254,29 @@ class CategoryDetailTestCase(TestCase):
             response.context["videos"] == [newest_video, video, oldest_video]
         )
 
+    def test_videos_are_paginated(self):
+        published_date = timezone.now()
+        videos = [
+            baker.make(
+                Video,
+                channel=self.channel,
+                published_date=published_date - datetime.timedelta(minutes=minutes),
+            )
+            for minutes in range(3)
+        ]
+        url = reverse(
+            "channels:category_details",
+            args=(self.category.user.username, self.category.slug,),
+        )
+
+        response = self.client.get(url, {"page_size": 2})
+        older_link = Selector(text=response.content.decode()).css("a.older::attr(href)")
+        older_response = self.client.get(url + older_link.get())
+
+        self.assertEqual(response.context["videos"], videos[:2])
+        self.assertEqual(older_response.context["videos"], videos[2:])
+        self.assertFalse(older_response.context["page"].has_next)
+
 
 class CategoryDetailAddChannelTestCase(TestCase):
     def setUp(self):
@@ -357,6 +381,86 @@ class NotLoggedUserDetailsTestCase(TestCase):
         self.assertTrue(len(videos) == 1)
         self.assertTrue(public_video in videos)
 
+    def test_videos_are_paginated(self):
+        user = User.objects.create_user("user", "user@test.com", "userpassword")
+        category = baker.make(Category, user=user, public=True)
+        channel = baker.make(Channel)
+        category.channels.add(channel)
+        videos = [
+            baker.make(
+                Video,
+                channel=channel,
+                published_date=timezone.now() - datetime.timedelta(minutes=minutes),
+            )
+            for minutes in range(3)
+        ]
+        url = reverse("channels:user_details", args=(user,))
+
+        response = self.client.get(url, {"page_size": 2})
+        older_response = self.client.get(
+            url, {"page_size": 2, "before": response.context["page"].next_cursor}
+        )
+
+        self.assertEqual(response.context["videos"], videos[:2])
+        self.assertEqual(older_response.context["videos"], videos[2:])
+
+    def test_videos_of_channel_in_several_categories_are_not_repeated(self):
+        user = User.objects.create_user("user", "user@test.com", "userpassword")
+        channel = baker.make(Channel)
+        for category in baker.make(Category, user=user, public=True, _quantity=2):
+            category.channels.add(channel)
+        video = baker.make(Video, channel=channel)
+        url = reverse("channels:user_details", args=(user,))
+
+        response = self.client.get(url)
+
+        self.assertEqual(response.context["videos"], [video])
+
+    def test_videos_of_all_categories_are_ordered_by_published_date(self):
+        user = User.objects.create_user("user", "user@test.com", "userpassword")
+        videos = []
+        for minutes in range(4):
+            category = baker.make(Category, user=user, public=True)
+            channel = baker.make(Channel)
+            category.channels.add(channel)
+            videos.append(
+                baker.make(
+                    Video,
+                    channel=channel,
+                    published_date=timezone.now()
+                    - datetime.timedelta(minutes=minutes),
+                )
+            )
+        url = reverse("channels:user_details", args=(user,))
+
+        response = self.client.get(url, {"page_size": 3})
+        older_response = self.client.get(
+            url, {"page_size": 3, "before": response.context["page"].next_cursor}
+        )
+
+        self.assertEqual(response.context["videos"], videos[:3])
+        self.assertEqual(older_response.context["videos"], videos[3:])
+
+    def test_videos_are_filtered_by_period(self):
+        user = User.objects.create_user("user", "user@test.com", "userpassword")
+        category = baker.make(Category, user=user, public=True)
+        channel = baker.make(Channel)
+        category.channels.add(channel)
+        recent_video = baker.make(Video, channel=channel)
+        old_video = baker.make(
+            Video,
+            channel=channel,
+            published_date=timezone.now() - datetime.timedelta(days=3),
+        )
+        url = reverse("channels:user_details", args=(user,))
+
+        last_24h = self.client.get(url)
+        week = self.client.get(url, {"period": "week"})
+
+        self.assertEqual(last_24h.context["period"], "last_24h")
+        self.assertEqual(last_24h.context["videos"], [recent_video])
+        self.assertEqual(week.context["videos"], [recent_video, old_video])
+
 
 class LoggedUserDetailsTestCase(TestCase):
     def setUp(self):
@@ -375,6 +479,18 @@ class LoggedUserDetailsTestCase(TestCase):
         response = self.client.get(url)
         self.assertEqual(response.status_code, 200)
 
+    def test_has_own_private_categories_and_videos_on_context(self):
+        category = baker.make(Category, user=self.user, public=False)
+        channel = baker.make(Channel)
+        category.channels.add(channel)
+        video = baker.make(Video, channel=channel)
+        url = reverse("channels:user_details", args=(self.user.username,))
+
+        response = self.client.get(url)
+
+        self.assertEqual(response.context["categories"], [category])
+        self.assertEqual(response.context["videos"], [video])
+
     def test_accessing_other_user_without_public_category(self):
         other_user = baker.make(User)
         baker.make(Category, user=other_user, public=False)
@@ -391,3 +507,116 @@ class LoggedUserDetailsTestCase(TestCase):
         response = self.client.get(url)
         self.assertEqual(response.status_code, 200)
 
+
+class TimelineQueryBudgetTestCase(QueryBudgetMixin, TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user("user", "user@test.com", "userpassword")
+        self.category = baker.make(Category, public=True, user=self.user)
+        baker.make(Category, public=True, user=self.user, _quantity=3)
+
+    def add_videos(self, quantity):
+        for channel in baker.make(Channel, _quantity=quantity):
+            self.category.channels.add(channel)
+            baker.make(Video, channel=channel, published_date=timezone.now())
+
+    def test_category_details_query_budget(self):
+        url = reverse(
+            "channels:category_details", args=(self.user.username, self.category.slug)
+        )
+
+        for quantity in (1, 20):
+            self.add_videos(quantity)
+            for period in ("last_24h", "week", "all"):
+                with self.subTest(videos=quantity, period=period):
+                    with self.assertMaxQueries(4):
+                        response = self.client.get(url, {"period": period})
+                    self.assertTrue(response.context["videos"])
+
+    def test_category_details_of_owner_query_budget(self):
+        self.client.login(username=self.user.username, password="userpassword")
+        url = reverse(
+            "channels:category_details", args=(self.user.username, self.category.slug)
+        )
+
+        for quantity in (1, 20):
+            self.add_videos(quantity)
+            with self.subTest(videos=quantity):
+                # Session and authenticated user lookups included
+                with self.assertMaxQueries(7):
+                    self.client.get(url, {"period": "all"})
+
+    def test_user_details_query_budget(self):
+        url = reverse("channels:user_details", args=(self.user.username,))
+
+        for quantity in (1, 20):
+            self.add_videos(quantity)
+            with self.subTest(videos=quantity):
+                # One timeline query for each of the 4 categories
+                with self.assertMaxQueries(7):
+                    response = self.client.get(url)
+                self.assertTrue(response.context["videos"])
+
+
+class AddChannelTestCase(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user("user", "user@test.com", "userpassword")
+        self.category = baker.make(Category, public=True, user=self.user)
+        self.client.login(username=self.user.username, password="userpassword")
+
+    def test_add_channel_enqueues_job(self):
+        response = self.client.post(
+            reverse("channels:add_channel"),
+            {
+                "category_id": self.category.id,
+                "current_url": self.category.get_absolute_url(),
+                "url": "https://www.youtube.com/channel/UCsn8UgBuRxGGqKmrAy5d3gA",
+            },
+        )
+
+        self.assertRedirects(
+            response, self.category.get_absolute_url(), fetch_redirect_response=False
+        )
+        job = Job.objects.get()
+        self.assertEqual(job.kind, "add_channel")
+        self.assertEqual(job.category, self.category)
+        self.assertEqual(
+            job.data["url"], "https://www.youtube.com/channel/UCsn8UgBuRxGGqKmrAy5d3gA"
+        )
+        self.assertFalse(Channel.objects.exists())
+
+    def test_can_not_add_channel_to_category_of_other_user(self):
+        other_category = baker.make(Category, public=True)
+
+        response = self.client.post(
+            reverse("channels:add_channel"),
+            {
+                "category_id": other_category.id,
+                "current_url": "/",
+                "url": "https://www.youtube.com/channel/UCsn8UgBuRxGGqKmrAy5d3gA",
+            },
+        )
+
+        self.assertEqual(response.status_code, 404)
+        self.assertFalse(Job.objects.exists())
+
+    def test_pending_jobs_on_category_context(self):
+        job = Job.objects.enqueue("add_channel", user=self.user, category=self.category)
+
+        response = self.client.get(self.category.get_absolute_url())
+
+        self.assertEqual(list(response.context["jobs"]), [job])
+
+    def test_job_status(self):
+        job = Job.objects.enqueue("add_channel", user=self.user, category=self.category)
+
+        response = self.client.get(reverse("channels:job_status", args=(job.id,)))
+
+        self.assertEqual(response.json()["status"], Job.PENDING)
+        self.assertIsNone(response.json()["channel"])
+
+    def test_job_status_of_other_user(self):
+        job = Job.objects.enqueue("add_channel", user=baker.make(User))
+
+        response = self.client.get(reverse("channels:job_status", args=(job.id,)))
+
+        self.assertEqual(response.status_code, 404)
@@ -0,0 +1,196 @@
+import datetime
+from io import StringIO
+from unittest.mock import patch
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from model_bakery import baker
+
+from channels import websub
+from channels.models import Channel, Video
+from channels.tests.utils import LocalHub, load_fixture
+
+CHANNEL_FEED_CONTENT = load_fixture("feed.xml")
+NOTIFICATION_CONTENT = load_fixture("websub_notification.xml")
+
+
+@override_settings(
+    WEBSUB_CALLBACK_URL="https://mediafeed.example.com",
+    WEBSUB_HUB_URL="https://hub.example.com/",
+)
+class WebSubTestCase(TestCase):
+    def setUp(self):
+        self.channel = baker.make(Channel)
+        self.hub = LocalHub(self.client)
+        self.patch_post = patch("channels.http.HTTPClient.post", self.hub.post)
+        self.patch_post.start()
+
+    def tearDown(self):
+        self.patch_post.stop()
+
+    def test_subscribe_sends_request_to_hub(self):
+        websub.subscribe(self.channel)
+
+        request = self.hub.requests[0]
+        self.assertEqual(request["hub.mode"], "subscribe")
+        self.assertEqual(request["hub.topic"], self.channel.feed_url)
+        self.assertEqual(
+            request["hub.callback"],
+            f"https://mediafeed.example.com/c/channel/{self.channel.pk}/websub/",
+        )
+        self.assertEqual(request["hub.secret"], websub.get_secret(self.channel))
+
+    def test_verified_subscription_stores_lease(self):
+        websub.subscribe(self.channel)
+
+        response = self.hub.verify(lease_seconds=3600)[0]
+
+        self.assertEqual(response.status_code, 200)
+        self.channel.refresh_from_db()
+        self.assertAlmostEqual(
+            self.channel.websub_expires_at,
+            timezone.now() + datetime.timedelta(hours=1),
+            delta=datetime.timedelta(minutes=1),
+        )
+
+    def test_verified_unsubscription_clears_lease(self):
+        websub.subscribe(self.channel)
+        self.hub.verify()
+
+        websub.unsubscribe(self.channel)
+        self.hub.verify()
+
+        self.channel.refresh_from_db()
+        self.assertIsNone(self.channel.websub_expires_at)
+
+    def test_verification_of_another_topic_is_rejected(self):
+        response = self.client.get(
+            f"/c/channel/{self.channel.pk}/websub/",
+            {
+                "hub.mode": "subscribe",
+                "hub.topic": "https://www.youtube.com/feeds/videos.xml?channel_id=X",
+                "hub.challenge": "challenge",
+            },
+        )
+
+        self.assertEqual(response.status_code, 404)
+
+    def test_verification_without_pending_request_is_rejected(self):
+        response = self.client.get(
+            f"/c/channel/{self.channel.pk}/websub/",
+            {
+                "hub.mode": "subscribe",
+                "hub.topic": self.channel.feed_url,
+                "hub.challenge": "challenge",
+            },
+        )
+
+        self.assertEqual(response.status_code, 404)
+        self.channel.refresh_from_db()
+        self.assertIsNone(self.channel.websub_expires_at)
+
+    def test_verification_is_accepted_once(self):
+        websub.subscribe(self.channel)
+        data = self.hub.requests[0]
+        self.hub.verify()
+
+        self.hub.requests = [data]
+        response = self.hub.verify()[0]
+
+        self.assertEqual(response.status_code, 404)
+
+    def test_lease_is_bounded(self):
+        for lease_seconds, expected in (
+            (10**12, datetime.timedelta(days=5)),
+            (-3600, datetime.timedelta(seconds=1)),
+        ):
+            with self.subTest(lease_seconds=lease_seconds):
+                websub.subscribe(self.channel)
+
+                response = self.hub.verify(lease_seconds=lease_seconds)[0]
+
+                self.assertEqual(response.status_code, 200)
+                self.channel.refresh_from_db()
+                self.assertAlmostEqual(
+                    self.channel.websub_expires_at,
+                    timezone.now() + expected,
+                    delta=datetime.timedelta(minutes=1),
+                )
+
+    def test_notification_is_ingested(self):
+        websub.subscribe(self.channel)
+        self.hub.verify()
+
+        response = self.hub.publish(self.channel.feed_url, CHANNEL_FEED_CONTENT)
+
+        self.assertEqual(response.status_code, 204)
+        self.assertEqual(self.channel.videos.count(), 3)
+
+    def test_youtube_notification_is_ingested(self):
+        websub.subscribe(self.channel)
+        self.hub.verify()
+
+        response = self.hub.publish(self.channel.feed_url, NOTIFICATION_CONTENT)
+
+        self.assertEqual(response.status_code, 204)
+        video = self.channel.videos.get()
+        self.assertEqual(video.video_id, "Qf7CcFvN3ys")
+        self.assertEqual(
+            video.thumbnail_image, "https://i.ytimg.com/vi/Qf7CcFvN3ys/hqdefault.jpg"
+        )
+
+    def test_notification_with_invalid_signature_is_ignored(self):
+        websub.subscribe(self.channel)
+        self.hub.verify()
+
+        response = self.hub.publish(
+            self.channel.feed_url, CHANNEL_FEED_CONTENT, secret="wrong"
+        )
+
+        self.assertEqual(response.status_code, 202)
+        self.assertFalse(Video.objects.exists())
+
+    def test_notification_without_signature_is_ignored(self):
+        response = self.client.post(
+            f"/c/channel/{self.channel.pk}/websub/",
+            CHANNEL_FEED_CONTENT,
+            content_type="application/atom+xml",
+        )
+
+        self.assertEqual(response.status_code, 202)
+        self.assertFalse(Video.objects.exists())
+
+    def test_subscribed_channel_is_polled_less_often(self):
+        websub.subscribe(self.channel)
+        self.hub.verify(lease_seconds=5 * 24 * 60 * 60)
+        self.channel.refresh_from_db()
+
+        self.hub.publish(self.channel.feed_url, CHANNEL_FEED_CONTENT)
+
+        self.channel.refresh_from_db()
+        self.assertGreaterEqual(
+            self.channel.next_sync_at - timezone.now(),
+            datetime.timedelta(hours=23),
+        )
+
+    def test_command_subscribes_channels_about_to_expire(self):
+        expiring = baker.make(
+            Channel, websub_expires_at=timezone.now() + datetime.timedelta(hours=1)
+        )
+        baker.make(
+            Channel, websub_expires_at=timezone.now() + datetime.timedelta(days=3)
+        )
+        stdout = StringIO()
+
+        call_command("websub_subscribe", stdout=stdout)
+
+        topics = {request["hub.topic"] for request in self.hub.requests}
+        self.assertEqual(topics, {self.channel.feed_url, expiring.feed_url})
+        self.assertIn("Requested 2 WebSub subscriptions", stdout.getvalue())
+
+    @override_settings(WEBSUB_CALLBACK_URL="")
+    def test_command_does_nothing_when_disabled(self):
+        call_command("websub_subscribe", stdout=StringIO())
+
+        self.assertEqual(self.hub.requests, [])
@@ -0,0 +1,84 @@
+import contextlib
+import hashlib
+import hmac
+import os
+import secrets
+from unittest.mock import Mock
+from urllib.parse import urlsplit
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "fixtures")
+
+
+def load_fixture(name):
+    with open(os.path.join(FIXTURES_DIR, name), "rb") as fixture:
+        return fixture.read()
+
+
+class QueryBudgetMixin:
+    @contextlib.contextmanager
+    def assertMaxQueries(self, budget):
+        """Fail when the block runs more than budget queries."""
+        with CaptureQueriesContext(connection) as context:
+            yield context
+
+        if len(context) > budget:
+            queries = "\n".join(
+                f"{index}. {query['sql']}"
+                for index, query in enumerate(context.captured_queries, start=1)
+            )
+            self.fail(
+                f"{len(context)} queries executed, the budget is {budget}:\n{queries}"
+            )
+
+
+class LocalHub:
+    """Stand-in for a WebSub hub, talking to the callbacks through a test client.
+
+    Use post as the replacement of HTTPClient.post to receive subscription
+    requests, then verify() and publish() to call the subscribers back.
+    """
+
+    def __init__(self, client):
+        self.client = client
+        self.requests = []
+        self.subscriptions = {}
+
+    def post(self, url, data=None, headers=None):
+        self.requests.append(data)
+        return Mock(status_code=202)
+
+    def verify(self, lease_seconds=3600):
+        responses = []
+        for data in self.requests:
+            challenge = secrets.token_hex(8)
+            response = self.client.get(
+                urlsplit(data["hub.callback"]).path,
+                {
+                    "hub.mode": data["hub.mode"],
+                    "hub.topic": data["hub.topic"],
+                    "hub.challenge": challenge,
+                    "hub.lease_seconds": lease_seconds,
+                },
+            )
+            if response.status_code == 200 and response.content.decode() == challenge:
+                if data["hub.mode"] == "subscribe":
+                    self.subscriptions[data["hub.topic"]] = data
+                else:
+                    self.subscriptions.pop(data["hub.topic"], None)
+            responses.append(response)
+        self.requests = []
+        return responses
+
+    def publish(self, topic, content, secret=None):
+        data = self.subscriptions[topic]
+        secret = secret or data["hub.secret"]
+        signature = hmac.new(secret.encode(), content, hashlib.sha1).hexdigest()
+        return self.client.post(
+            urlsplit(data["hub.callback"]).path,
+            content,
+            content_type="application/atom+xml",
+            HTTP_X_HUB_SIGNATURE=f"sha1={signature}",
+        )
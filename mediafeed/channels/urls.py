@@ -4,7 +4,19 @@ from channels import views
 
 app_name = "channels"
 urlpatterns = [
+    path("channel/", views.add_channel, name="add_channel"),
+    path("channel/jobs/<int:job_id>/", views.job_status, name="job_status"),
+    path(
+        "channel/<int:channel_id>/websub/",
+        views.websub_callback,
+        name="websub_callback",
+    ),
+    path("feeds/<username>/<feed_format>.xml", views.user_feed, name="user_feed"),
+    path(
+        "feeds/<username>/<slug>/<feed_format>.xml",
+        views.category_feed,
+        name="category_feed",
+    ),
     path("<username>/", views.user_details, name="user_details"),
     path("<username>/<slug>/", views.category_details, name="category_details"),
-    path("channel/", views.add_channel, name="add_channel"),
 ]
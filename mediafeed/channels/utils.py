@@ -1,18 +1,49 @@
+import datetime
+import hashlib
+import math
 import re
-from urllib.parse import urlencode
+import statistics
+from urllib.parse import urlencode, urlsplit, urlunsplit
 
-import requests
 from django.conf import settings
+from django.core.cache import caches
 from parsel import Selector
 
+from channels.http import get_http_client
+
+MISSING = object()
+
+
+def normalize_channel_url(url):
+    parts = urlsplit(url.strip())
+    netloc = parts.netloc.lower()
+    if netloc in ("youtube.com", "m.youtube.com"):
+        netloc = "www.youtube.com"
+    return urlunsplit(("https", netloc, parts.path.rstrip("/"), "", ""))
+
 
 def get_channel_title(url):
-    response = requests.get(url)
+    cache = caches[settings.CHANNEL_METADATA_CACHE]
+    normalized_url = normalize_channel_url(url)
+    cache_key = "channel-title:" + hashlib.sha1(normalized_url.encode()).hexdigest()
 
+    channel_title = cache.get(cache_key, MISSING)
+    if channel_title is not MISSING:
+        return channel_title
+
+    channel_title = None
+    response = get_http_client().get(url)
     if response.status_code == 200:
         selector = Selector(response.content.decode("utf-8"))
         channel_title = selector.xpath("//meta[@itemprop='name']/@content").get()
-        return channel_title
+
+    if channel_title:
+        cache.set(cache_key, channel_title)
+    else:
+        # Pages without a title are cached for a shorter time, so repeated
+        # adds of a bad URL do not hit the network every time
+        cache.set(cache_key, None, settings.CHANNEL_METADATA_NEGATIVE_TIMEOUT)
+    return channel_title
 
 
 def get_channel_feed_url(url):
@@ -30,3 +61,31 @@ def get_channel_feed_url(url):
         params = urlencode(params)
         feed_url = f"{settings.BASE_YOUTUBE_FEED_URL}?{params}"
         return feed_url
+
+
+def get_sync_interval(published_dates, previous_interval=None, new_videos=True):
+    min_interval = datetime.timedelta(seconds=settings.SYNC_MIN_INTERVAL)
+    max_interval = datetime.timedelta(seconds=settings.SYNC_MAX_INTERVAL)
+
+    if not new_videos and previous_interval is not None:
+        interval = previous_interval * settings.SYNC_BACKOFF_FACTOR
+    else:
+        published_dates = sorted(published_dates, reverse=True)
+        gaps = [
+            newer - older for newer, older in zip(published_dates, published_dates[1:])
+        ]
+        if gaps:
+            # Poll twice per typical upload gap of the channel
+            interval = statistics.median(gaps) / 2
+        else:
+            interval = min_interval
+
+    return max(min_interval, min(interval, max_interval))
+
+
+def get_failure_backoff(failure_count):
+    min_interval = datetime.timedelta(seconds=settings.SYNC_MIN_INTERVAL)
+    max_interval = datetime.timedelta(seconds=settings.SYNC_MAX_INTERVAL)
+    # Doubling past max_interval would only overflow timedelta
+    exponent = min(failure_count - 1, math.ceil(math.log2(max_interval / min_interval)))
+    return min(min_interval * 2**exponent, max_interval)
@@ -1,78 +1,248 @@
+import datetime
+import logging
+from xml.etree.ElementTree import ParseError
+
+from django.conf import settings
 from django.contrib import messages
+from django.contrib.auth.decorators import login_required
 from django.contrib.auth.models import User
-from django.http import Http404
+from django.http import Http404, HttpResponse, JsonResponse
 from django.shortcuts import get_object_or_404, redirect, render
-
-from channels.models import Category, Channel, Video
-
-
+from django.urls import reverse
+from django.utils import timezone
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_http_methods, require_POST
+
+from channels import websub
+from channels.feeds import parse_feed
+from channels.models import Category, Channel, Job, TimelineEntry, Video
+from channels.page_cache import cache_feed, cache_timeline_page
+from channels.pagination import get_page_size, paginate, paginate_merged
+from channels.syndication import feed_response, get_feed_class
+
+logger = logging.getLogger(__name__)
+
+
+def get_merged_timeline(categories, period, page_size, cursor=None):
+    # One index range scan per category, merged and deduplicated by video
+    page = paginate_merged(
+        [
+            TimelineEntry.objects.filter(category=category)
+            .for_period(period)
+            .only("published_date", "video_id")
+            for category in categories
+        ],
+        cursor=cursor,
+        page_size=page_size,
+        tiebreaker="video_id",
+    )
+    videos = Video.objects.for_timeline().in_bulk(
+        [entry.video_id for entry in page.items]
+    )
+    return page, [videos[entry.video_id] for entry in page.items]
+
+
+@cache_timeline_page
 def category_details(request, username, slug):
     user = get_object_or_404(User, username=username)
     if request.user.is_authenticated and user == request.user:
         selected_category = get_object_or_404(Category, slug=slug, user=user)
-        categories = Category.objects.filter(user=request.user).order_by("title")
+        categories = Category.objects.filter(user=request.user)
     else:
         selected_category = get_object_or_404(
             Category, slug=slug, user=user, public=True
         )
-        categories = Category.objects.filter(user=user, public=True).order_by("title")
-
-    videos_of_category = Video.objects.for_categories([selected_category])
+        categories = Category.objects.filter(user=user, public=True)
+    categories = categories.select_related("user").order_by("title")
 
     period = request.GET.get("period", "last_24h")
-    video_by_period = {
-        "all": videos_of_category.all(),
-        "week": videos_of_category.last_week(),
-        "last_24h": videos_of_category.last_24h(),
-    }
-    videos = video_by_period.get(period, []).order_by("-published_date")
+    page = paginate(
+        TimelineEntry.objects.filter(category=selected_category)
+        .for_period(period)
+        .for_timeline(),
+        cursor=request.GET.get("before"),
+        page_size=get_page_size(request.GET.get("page_size")),
+        tiebreaker="video_id",
+    )
+
+    jobs = []
+    if request.user == user:
+        jobs = Job.objects.filter(
+            category=selected_category, status__in=[Job.PENDING, Job.RUNNING]
+        )
 
     context = {
         "user": user,
         "selected_category": selected_category,
         "period": period,
         "categories": categories,
-        "videos": list(videos),
+        "videos": [entry.video for entry in page.items],
+        "page": page,
+        "jobs": jobs,
     }
 
     return render(request, "category_details.html", context=context)
 
 
+@cache_timeline_page
 def user_details(request, username):
     user = get_object_or_404(User, username=username)
-    categories = []
 
     if request.user == user:
-        ...
+        categories = Category.objects.filter(user=user)
     else:
-        categories = Category.objects.filter(user=user, public=True).order_by("title")
-        if not categories:
-            raise Http404()
+        categories = Category.objects.filter(user=user, public=True)
+    categories = list(categories.select_related("user").order_by("title"))
+    if not categories and request.user != user:
+        raise Http404()
 
-    videos = Video.objects.for_categories(categories)
+    period = request.GET.get("period", "last_24h")
+    page, videos = get_merged_timeline(
+        categories,
+        period=period,
+        cursor=request.GET.get("before"),
+        page_size=get_page_size(request.GET.get("page_size")),
+    )
 
     context = {
+        "user": user,
         "categories": categories,
+        "has_public_categories": any(category.public for category in categories),
+        "period": period,
         "videos": videos,
+        "page": page,
     }
 
     return render(request, "user_details.html", context=context)
 
 
+@cache_feed
+def category_feed(request, username, slug, feed_format):
+    feed_class = get_feed_class(feed_format)
+    category = get_object_or_404(
+        Category.objects.select_related("user"),
+        user__username=username,
+        slug=slug,
+        public=True,
+    )
+    entries = (
+        TimelineEntry.objects.filter(category=category)
+        .for_timeline()
+        .order_by("-published_date", "video_id")
+    )
+
+    feed = feed_class(
+        title=f"{category.title} ({username})",
+        link=request.build_absolute_uri(category.get_absolute_url()),
+        description=f"Latest videos of {category.title} on MediaFeed",
+        feed_url=request.build_absolute_uri(),
+    )
+    videos = (
+        entry.video for entry in entries[: settings.SYNDICATION_FEED_SIZE].iterator()
+    )
+    return feed_response(feed, videos)
+
+
+@cache_feed
+def user_feed(request, username, feed_format):
+    feed_class = get_feed_class(feed_format)
+    user = get_object_or_404(User, username=username)
+    categories = list(Category.objects.filter(user=user, public=True))
+    if not categories:
+        raise Http404()
+
+    _, videos = get_merged_timeline(
+        categories, period="all", page_size=settings.SYNDICATION_FEED_SIZE
+    )
+    feed = feed_class(
+        title=username,
+        link=request.build_absolute_uri(
+            reverse("channels:user_details", args=(username,))
+        ),
+        description=f"Latest videos of {username} on MediaFeed",
+        feed_url=request.build_absolute_uri(),
+    )
+    return feed_response(feed, videos)
+
+
+@login_required
+@require_POST
 def add_channel(request):
-    if request.method == "POST":
-        category_id = request.POST.get("category_id")
-        current_url = request.POST.get("current_url")
-        channel_url = request.POST.get("url")
-
-        channel = Channel.objects.create(url=channel_url)
-        channel.sync_videos()
-
-        messages.success(
-            request, f'Channel "{channel.title}" has been successfully added.'
-        )
-
-        category = Category.objects.get(id=category_id)
-        category.channels.add(channel)
-
-        return redirect(current_url)
+    category_id = request.POST.get("category_id")
+    current_url = request.POST.get("current_url")
+    channel_url = request.POST.get("url")
+
+    category = get_object_or_404(Category, id=category_id, user=request.user)
+    Job.objects.enqueue(
+        "add_channel", user=request.user, category=category, url=channel_url
+    )
+
+    messages.info(
+        request, f'Channel "{channel_url}" is being added. It will show up soon.'
+    )
+
+    return redirect(current_url)
+
+
+@login_required
+def job_status(request, job_id):
+    job = get_object_or_404(Job, id=job_id, user=request.user)
+
+    return JsonResponse(
+        {
+            "id": job.id,
+            "kind": job.kind,
+            "status": job.status,
+            "channel": job.channel.title if job.channel else None,
+            "error": job.error,
+        }
+    )
+
+
+@csrf_exempt
+@require_http_methods(["GET", "POST"])
+def websub_callback(request, channel_id):
+    channel = get_object_or_404(Channel, id=channel_id)
+
+    if request.method == "GET":
+        # Verification of a (un)subscription request sent to the hub, which
+        # must be the one we are waiting for
+        mode = request.GET.get("hub.mode")
+        if (
+            request.GET.get("hub.topic") != channel.feed_url
+            or mode not in ("subscribe", "unsubscribe")
+            or mode != channel.websub_pending_mode
+        ):
+            raise Http404
+
+        if mode == "subscribe":
+            try:
+                lease_seconds = int(request.GET["hub.lease_seconds"])
+            except (KeyError, ValueError):
+                lease_seconds = settings.WEBSUB_LEASE_SECONDS
+            # Leases longer than requested would delay renewals and polling
+            lease_seconds = max(1, min(lease_seconds, settings.WEBSUB_LEASE_SECONDS))
+            channel.websub_expires_at = timezone.now() + datetime.timedelta(
+                seconds=lease_seconds
+            )
+        else:
+            channel.websub_expires_at = None
+        channel.websub_pending_mode = ""
+        channel.save(update_fields=["websub_expires_at", "websub_pending_mode"])
+        return HttpResponse(request.GET.get("hub.challenge", ""))
+
+    # Hubs expect a 2xx even for notifications that are ignored, otherwise
+    # they keep retrying them
+    signature = request.headers.get("X-Hub-Signature")
+    if not websub.is_valid_signature(channel, signature, request.body):
+        logger.warning("Invalid WebSub signature for channel %s", channel.pk)
+        return HttpResponse(status=202)
+
+    try:
+        entries = list(parse_feed(request.body))
+    except ParseError:
+        logger.warning("Invalid WebSub notification for channel %s", channel.pk)
+        return HttpResponse(status=202)
+
+    channel.ingest_feed(entries)
+    return HttpResponse(status=204)
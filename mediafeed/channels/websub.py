@@ -0,0 +1,69 @@
+import hashlib
+import hmac
+
+from django.conf import settings
+from django.urls import reverse
+from django.utils.crypto import salted_hmac
+
+from channels.http import get_http_client
+
+SIGNATURE_ALGORITHMS = {
+    "sha1": hashlib.sha1,
+    "sha256": hashlib.sha256,
+    "sha384": hashlib.sha384,
+    "sha512": hashlib.sha512,
+}
+
+
+def is_enabled():
+    return bool(settings.WEBSUB_CALLBACK_URL)
+
+
+def get_secret(channel):
+    # Derived from SECRET_KEY, so there is nothing to store or leak per channel
+    return salted_hmac("channels.websub", channel.feed_url).hexdigest()
+
+
+def get_callback_url(channel):
+    path = reverse("channels:websub_callback", args=[channel.pk])
+    return settings.WEBSUB_CALLBACK_URL.rstrip("/") + path
+
+
+def subscribe(channel, mode="subscribe"):
+    """Ask the hub to (un)subscribe the callback of channel to its feed.
+
+    The hub confirms the request asynchronously by calling the callback with a
+    challenge, which is when the subscription lease is stored. Only the
+    mode requested last is confirmed.
+    """
+    channel.websub_pending_mode = mode
+    channel.save(update_fields=["websub_pending_mode"])
+
+    response = get_http_client().post(
+        settings.WEBSUB_HUB_URL,
+        data={
+            "hub.callback": get_callback_url(channel),
+            "hub.topic": channel.feed_url,
+            "hub.mode": mode,
+            "hub.verify": "async",
+            "hub.secret": get_secret(channel),
+            "hub.lease_seconds": settings.WEBSUB_LEASE_SECONDS,
+        },
+    )
+    response.raise_for_status()
+    return response
+
+
+def unsubscribe(channel):
+    return subscribe(channel, mode="unsubscribe")
+
+
+def is_valid_signature(channel, signature, body):
+    try:
+        algorithm, digest = signature.split("=", 1)
+        digestmod = SIGNATURE_ALGORITHMS[algorithm]
+    except (AttributeError, KeyError, ValueError):
+        return False
+
+    expected = hmac.new(get_secret(channel).encode(), body, digestmod).hexdigest()
+    return hmac.compare_digest(expected, digest)
@@ -29,7 +29,7 @@ INSTALLED_APPS = [
     "django.contrib.staticfiles",
     "django_crontab",
     "core",
-    "channels",
+    "channels.apps.ChannelsConfig",
 ]
 
 MIDDLEWARE = [
@@ -78,6 +78,43 @@ DATABASES = {
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/3.0/topics/cache/
+
+CACHES = {
+    "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+    "channel-metadata": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "channel-metadata",
+        "TIMEOUT": config(
+            "CHANNEL_METADATA_CACHE_TIMEOUT", default=24 * 60 * 60, cast=int
+        ),
+        "OPTIONS": {
+            "MAX_ENTRIES": config(
+                "CHANNEL_METADATA_CACHE_MAX_ENTRIES", default=10000, cast=int
+            ),
+        },
+    },
+    # Rendered timelines of anonymous visitors. Their versions are bumped by
+    # the sync process, so this must be a cache shared by every process, such
+    # as memcached; the dummy default disables page caching.
+    "timelines": {
+        "BACKEND": config(
+            "TIMELINE_CACHE_BACKEND",
+            default="django.core.cache.backends.dummy.DummyCache",
+        ),
+        "LOCATION": config("TIMELINE_CACHE_LOCATION", default=""),
+        "TIMEOUT": config("TIMELINE_CACHE_TIMEOUT", default=60 * 60, cast=int),
+    },
+}
+
+CHANNEL_METADATA_CACHE = "channel-metadata"
+TIMELINE_CACHE = "timelines"
+CHANNEL_METADATA_NEGATIVE_TIMEOUT = config(
+    "CHANNEL_METADATA_NEGATIVE_TIMEOUT", default=10 * 60, cast=int
+)
+
+
 # Password validation
 # https://docs.djangoproject.com/en/3.0/ref/settings/#auth-password-validators
 
@@ -114,7 +151,88 @@ BASE_YOUTUBE_FEED_URL = "https://www.youtube.com/feeds/videos.xml"
 
 CRONJOBS = [
     ("*/30 * * * *", "django.core.management.call_command", ["sync_channels"]),
+    ("0 */6 * * *", "django.core.management.call_command", ["websub_subscribe"]),
 ]
 
+# Videos per page of the category and user timelines, which can be changed
+# with ?page_size= up to TIMELINE_MAX_PAGE_SIZE
+TIMELINE_PAGE_SIZE = config("TIMELINE_PAGE_SIZE", default=60, cast=int)
+TIMELINE_MAX_PAGE_SIZE = config("TIMELINE_MAX_PAGE_SIZE", default=200, cast=int)
+
+# Seconds browsers and proxies may reuse public timeline pages without
+# revalidating them
+TIMELINE_MAX_AGE = config("TIMELINE_MAX_AGE", default=60, cast=int)
+
+# Newest videos in the Atom and RSS feeds of categories and users
+SYNDICATION_FEED_SIZE = config("SYNDICATION_FEED_SIZE", default=50, cast=int)
+
+HTTP_CLIENT = {
+    "BACKEND": "channels.http.HTTPClient",
+    "OPTIONS": {
+        "timeout": (
+            config("HTTP_CONNECT_TIMEOUT", default=5, cast=float),
+            config("HTTP_READ_TIMEOUT", default=30, cast=float),
+        ),
+        "retries": config("HTTP_RETRIES", default=3, cast=int),
+        "backoff": config("HTTP_BACKOFF", default=0.5, cast=float),
+        "max_response_size": config(
+            "HTTP_MAX_RESPONSE_SIZE", default=5 * 1024 * 1024, cast=int
+        ),
+        "pool_size": config("HTTP_POOL_SIZE", default=10, cast=int),
+    },
+}
+
+SYNC_WORKERS = config("SYNC_WORKERS", default=1, cast=int)
+SYNC_BATCH_SIZE = config("SYNC_BATCH_SIZE", default=50, cast=int)
+# Seconds a sync worker may hold the channels it claimed before they are
+# handed out to other workers again
+SYNC_LEASE_TIMEOUT = config("SYNC_LEASE_TIMEOUT", default=10 * 60, cast=int)
+# Days a SyncRun and its per-channel results are kept
+SYNC_RUN_RETENTION = config("SYNC_RUN_RETENTION", default=7, cast=int)
+
+# Bounds (in seconds) of the per-channel polling interval, estimated from the
+# gaps between the latest SYNC_HISTORY_SIZE uploads of each channel
+SYNC_MIN_INTERVAL = config("SYNC_MIN_INTERVAL", default=30 * 60, cast=int)
+SYNC_MAX_INTERVAL = config("SYNC_MAX_INTERVAL", default=24 * 60 * 60, cast=int)
+SYNC_HISTORY_SIZE = config("SYNC_HISTORY_SIZE", default=10, cast=int)
+SYNC_BACKOFF_FACTOR = config("SYNC_BACKOFF_FACTOR", default=1.5, cast=float)
+# Failing channels are retried after SYNC_MIN_INTERVAL, doubled on each
+# consecutive failure, and parked after SYNC_MAX_FAILURES of them
+SYNC_MAX_FAILURES = config("SYNC_MAX_FAILURES", default=10, cast=int)
+
+# WebSub (PubSubHubbub) push notifications are only used when the public
+# base URL the hub calls back is set, e.g. https://mediafeed.example.com
+WEBSUB_CALLBACK_URL = config("WEBSUB_CALLBACK_URL", default="")
+WEBSUB_HUB_URL = config(
+    "WEBSUB_HUB_URL", default="https://pubsubhubbub.appspot.com/subscribe"
+)
+WEBSUB_LEASE_SECONDS = config(
+    "WEBSUB_LEASE_SECONDS", default=5 * 24 * 60 * 60, cast=int
+)
+# Subscriptions expiring within this many seconds are renewed
+WEBSUB_RENEW_MARGIN = config("WEBSUB_RENEW_MARGIN", default=24 * 60 * 60, cast=int)
+# Polling interval of channels with an active subscription
+WEBSUB_FALLBACK_INTERVAL = config(
+    "WEBSUB_FALLBACK_INTERVAL", default=24 * 60 * 60, cast=int
+)
+
+# Raw feed entries are kept inline in the Feed table unless a blob store is
+# configured, in which case they are stored compressed and content-addressed
+# and Feed only keeps their digests.
+FEED_BLOB_STORE = None
+if config("FEED_BLOB_STORE_LOCATION", default=""):
+    FEED_BLOB_STORE = {
+        "BACKEND": "channels.blobs.FileSystemBlobStore",
+        "OPTIONS": {"location": config("FEED_BLOB_STORE_LOCATION")},
+    }
+elif config("FEED_BLOB_STORE_DATABASE", default=False, cast=bool):
+    FEED_BLOB_STORE = {"BACKEND": "channels.blobs.DatabaseBlobStore"}
+
+# Background jobs processed by the run_jobs command. Delays are in seconds.
+JOB_MAX_ATTEMPTS = config("JOB_MAX_ATTEMPTS", default=3, cast=int)
+JOB_RETRY_DELAY = config("JOB_RETRY_DELAY", default=60, cast=int)
+JOB_TIMEOUT = config("JOB_TIMEOUT", default=10 * 60, cast=int)
+JOB_POLL_INTERVAL = config("JOB_POLL_INTERVAL", default=5, cast=int)
+
 LOGIN_REDIRECT_URL = "core:user_profile"
 LOGOUT_REDIRECT_URL = "login"
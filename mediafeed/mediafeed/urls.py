@@ -22,5 +22,6 @@ urlpatterns = [
     path("admin/", admin.site.urls),
     path("auth/", include("django.contrib.auth.urls")),
     path("c/", include("channels.urls")),
+    path("api/", include("channels.api_urls")),
     path("", include("core.urls")),
 ] + static(settings.STATIC_URL, document_root=settings.STATIC_ROOT)